@@ -0,0 +1,973 @@
+"""
+Shared IDE Helper Core
+
+Common implementation behind the IDE integrations (the universal
+``olympus_ide_helper.py`` script and the JetBrains external tool): pooled
+HTTP session, response cache, streaming, file context, language detection,
+prompt templates and the newline-delimited JSON daemon loop.
+
+Standalone on purpose: it does not import the ``integration`` package, so
+the scripts start quickly and can be installed by copying this file next
+to them.
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import math
+import mmap
+import sys
+import os
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache, wraps
+from itertools import islice
+from typing import Optional, Dict, Any, List, Tuple, TextIO
+
+# orjson is optional; it (de)serializes request and response bodies several
+# times faster than the stdlib json module
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _json_loads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_GZIP_JSON_HEADERS = {**_JSON_HEADERS, "Content-Encoding": "gzip"}
+
+# Request bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+# HTTP libraries are imported on first use so that start-up, argument errors
+# and file-only work do not pay for them.
+requests = None
+httpx = None
+_SESSION = None
+
+
+def _load_requests():
+    """Import requests on first use and return the module"""
+    global requests
+    if requests is None:
+        import requests as _requests
+        requests = _requests
+    return requests
+
+
+def _get_session():
+    """Return the shared pooled session, importing requests on first use.
+
+    One session per process lets repeated IDE actions reuse the socket to Ollama.
+    """
+    global _SESSION
+    if _SESSION is None:
+        requests = _load_requests()
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.headers.update({"Connection": "keep-alive"})
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _load_httpx():
+    """Import httpx for the async API; returns None when it is not installed"""
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as _httpx
+        except ImportError:
+            return None
+        httpx = _httpx
+    return httpx
+
+
+# Files up to this size are read in one call instead of line by line
+SMALL_FILE_BYTES = 64 * 1024
+
+# Files above this size are memory-mapped and only the kept lines are decoded
+MMAP_MIN_BYTES = 512 * 1024
+
+# File extension -> language, and language -> test framework
+_LANG_MAP = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.jsx': 'React JSX',
+    '.tsx': 'React TSX',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c': 'C',
+    '.h': 'C Header',
+    '.hpp': 'C++ Header',
+    '.cs': 'C#',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.php': 'PHP',
+    '.rb': 'Ruby',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.scala': 'Scala',
+    '.r': 'R',
+    '.sql': 'SQL',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.less': 'LESS',
+    '.json': 'JSON',
+    '.xml': 'XML',
+    '.yaml': 'YAML',
+    '.yml': 'YAML',
+    '.toml': 'TOML',
+    '.md': 'Markdown',
+    '.sh': 'Shell Script',
+    '.bash': 'Bash Script',
+    '.zsh': 'Zsh Script'
+}
+_LANG_MAP_GET = _LANG_MAP.get
+
+_TEST_FRAMEWORKS = {
+    'Python': 'pytest',
+    'JavaScript': 'Jest',
+    'TypeScript': 'Jest',
+    'Java': 'JUnit',
+    'C#': 'NUnit',
+    'Go': 'Go testing package',
+    'Rust': 'Rust built-in testing'
+}
+
+# Prompt templates. Each prompt is laid out as file context, then the action's
+# fixed instructions, then the per-call request, so consecutive actions on the
+# same file share a prefix that Ollama can reuse from its KV cache.
+REQUEST_SEPARATOR = "\n\n---\n"
+
+GENERATE_INSTRUCTIONS = (
+    "Generate the requested code with proper formatting, documentation, and error handling."
+)
+
+DEBUG_INSTRUCTIONS = """Analyze the code below for:
+1. Syntax errors
+2. Logical errors
+3. Performance issues
+4. Security vulnerabilities
+5. Best practice violations
+
+Provide specific fixes and explanations."""
+
+EXPLAIN_INSTRUCTIONS = """Provide a clear, detailed explanation of the code below:
+1. What this code does
+2. How it works step by step
+3. Input and output
+4. Any important details or edge cases
+5. Potential improvements"""
+
+REFACTOR_INSTRUCTIONS = """Refactor the code below to improve:
+1. Readability and maintainability
+2. Performance
+3. Code structure and organization
+4. Adherence to best practices
+5. Error handling
+
+Provide the refactored code with explanations."""
+
+TEST_INSTRUCTIONS = """Generate comprehensive unit tests for the code below using {framework}:
+1. Test normal functionality
+2. Test edge cases and boundary conditions
+3. Test error handling
+4. Include setup and teardown if needed
+5. Use descriptive test names and assertions"""
+
+CHAT_INSTRUCTIONS = "Please provide a helpful response based on the context and question."
+
+# Actions that can share one request in BaseHelper.batch, with the
+# marker the model is asked to put in front of each answer.
+BATCH_SECTIONS = {
+    'debug': ('<<DEBUG>>', DEBUG_INSTRUCTIONS),
+    'explain': ('<<EXPLAIN>>', EXPLAIN_INSTRUCTIONS),
+    'refactor': ('<<REFACTOR>>', REFACTOR_INSTRUCTIONS),
+    'test': ('<<TESTS>>', TEST_INSTRUCTIONS),
+}
+
+
+def _file_suffix(file_path: str) -> str:
+    """Return the file extension like Path(file_path).suffix, without building a Path"""
+    name = file_path[max(file_path.rfind('/'), file_path.rfind('\\')) + 1:]
+    i = name.rfind('.')
+    return name[i:] if 0 < i < len(name) - 1 else ''
+
+
+@lru_cache(maxsize=64)
+def _read_file_context(file_path: str, mtime_ns: int, size: int, max_lines: int) -> str:
+    """Read a file's head and tail; cached per (path, mtime, size) snapshot.
+
+    Large files are streamed so only the kept lines are held in memory.
+    """
+    if size > MMAP_MIN_BYTES:
+        return _read_mapped_file_context(file_path, max_lines)
+    
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        # Small files: one read, no line splitting, when they fit
+        if size <= SMALL_FILE_BYTES:
+            content = f.read()
+            if content.count('\n') < max_lines:
+                return content
+            f.seek(0)
+        
+        half = max_lines // 2
+        head = list(islice(f, max_lines - half))
+        tail = deque(maxlen=half)
+        total = len(head)
+        for line in f:
+            tail.append(line)
+            total += 1
+    
+    if total <= max_lines:
+        return ''.join(head) + ''.join(tail)
+    
+    # Take first half and last half
+    return ''.join(head[:half]) + "\n... (truncated) ...\n" + ''.join(tail)
+
+
+def _decode_lines(data: bytes) -> str:
+    """Decode a byte range the way text-mode reading would"""
+    return data.decode('utf-8', 'ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _read_mapped_file_context(file_path: str, max_lines: int) -> str:
+    """Head and tail of a large file, located in a memory map.
+
+    Only the byte ranges of the kept lines are copied and decoded, so the cost
+    does not grow with the size of the file.
+    """
+    half = max_lines // 2
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        size = len(m)
+        
+        # End offsets of the first `half` and `max_lines - half` lines
+        head_end = head_half_end = 0
+        for i in range(max_lines - half):
+            newline = m.find(b'\n', head_end)
+            head_end = size if newline < 0 else newline + 1
+            if i < half:
+                head_half_end = head_end
+            if newline < 0:
+                break
+        
+        # Start offset of the last `half` lines
+        tail_start = size
+        search_end = size - 1 if m[size - 1:size] == b'\n' else size
+        for _ in range(half):
+            newline = m.rfind(b'\n', 0, search_end)
+            if newline < 0:
+                tail_start = 0
+                break
+            tail_start = newline + 1
+            search_end = newline
+        
+        if tail_start <= head_end:
+            # The head and tail meet: the file has at most max_lines lines
+            return _decode_lines(m[:])
+        
+        return (_decode_lines(m[:head_half_end]) + "\n... (truncated) ...\n"
+                + _decode_lines(m[tail_start:]))
+
+
+class LatencyHistogram:
+    """Bounded window of latency samples (microseconds) with percentile queries"""
+    
+    def __init__(self, max_samples: int = 1024):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+    
+    def record(self, value_us: int):
+        self.samples.append(value_us)
+        self.count += 1
+    
+    def percentile(self, p: float) -> Optional[int]:
+        """Nearest-rank percentile over the retained samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+# Per-operation latency histograms, reported by the 'metrics' action
+_METRICS: Dict[str, LatencyHistogram] = {}
+
+
+def timed(name: str):
+    """Record the wall time of each call under ``name`` in _METRICS"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram = _METRICS.get(name)
+                if histogram is None:
+                    histogram = _METRICS[name] = LatencyHistogram()
+                histogram.record((time.perf_counter_ns() - start) // 1000)
+        return wrapper
+    return decorator
+
+
+def metrics_snapshot() -> Dict[str, Dict[str, Optional[int]]]:
+    """P50/P95/P99 latency in microseconds for every timed operation"""
+    return {
+        name: {
+            "count": h.count,
+            "p50_us": h.percentile(50),
+            "p95_us": h.percentile(95),
+            "p99_us": h.percentile(99)
+        }
+        for name, h in _METRICS.items()
+    }
+
+
+class ResponseCache:
+    """
+    Two-tier cache of model responses.
+
+    The exact tier is an LRU keyed by a hash of model, temperature and prompt.
+    The optional semantic tier compares prompt embeddings and returns the
+    response of the most similar cached prompt above a cosine threshold,
+    considering only entries stored with the same scope (model, options and
+    action), so e.g. an explanation is never served for a refactor request.
+    Entries expire after ``ttl`` seconds on the monotonic clock.
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 3600.0,
+                 similarity_threshold: float = 0.92):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        # key -> (expires_at, response, embedding, scope)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(model_name: str, temperature: float, prompt: str, max_tokens: int = 0) -> str:
+        """Build the exact-match key for a request"""
+        raw = f"{model_name}|{round(temperature, 3)}|{max_tokens}|{prompt}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for an exact key, if still fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+    
+    def get_similar(self, embedding: List[float], scope: Optional[tuple] = None) -> Optional[str]:
+        """Return the response in ``scope`` whose prompt embedding is closest, if close enough"""
+        now = time.monotonic()
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        best_score, best_response = 0.0, None
+        for expires_at, response, cached, cached_scope in self._entries.values():
+            if (cached is None or cached_scope != scope or expires_at < now
+                    or len(cached) != len(embedding)):
+                continue
+            cached_norm = math.sqrt(sum(x * x for x in cached)) or 1.0
+            score = sum(a * b for a, b in zip(embedding, cached)) / (norm * cached_norm)
+            if score > best_score:
+                best_score, best_response = score, response
+        return best_response if best_score >= self.similarity_threshold else None
+    
+    def put(self, key: str, response: str, embedding: Optional[List[float]] = None,
+            scope: Optional[tuple] = None):
+        """Store a response, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, response, embedding, scope)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached responses"""
+        self._entries.clear()
+
+
+class BaseHelper:
+    """
+    Olympus Coder client shared by the IDE integrations.
+
+    Subclasses only decide where their configuration comes from; sessions,
+    caching, streaming, file context and prompts all live here.
+    """
+    
+    # Default num_predict per action; max_tokens caps each of them
+    _ACTION_TOKEN_BUDGET = {
+        'explain': 512,
+        'debug': 1024,
+        'refactor': 1536,
+        'test': 2048,
+        'generate': 1536,
+        'chat': 768,
+    }
+    
+    # Include the surrounding file, not only its name, when explaining or
+    # refactoring a selection
+    selection_file_context = False
+    
+    def __init__(self, 
+                 ollama_url: str = "http://localhost:11434",
+                 model_name: str = "olympus-coder-v1:latest",
+                 temperature: float = 0.1,
+                 max_tokens: int = 2048,
+                 use_cache: bool = True,
+                 semantic_cache: bool = False,
+                 keep_alive: str = "30m",
+                 compress_requests: bool = False,
+                 timeout: float = 60):
+        self.ollama_url = ollama_url
+        self.model_name = model_name
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.keep_alive = keep_alive
+        # Off by default: Ollama itself does not decode gzip request bodies, so
+        # this is only for servers behind a proxy that does (e.g. remote Ollama)
+        self.compress_requests = compress_requests
+        self.timeout = timeout
+        self._session = None
+        self.use_cache = use_cache
+        self.semantic_cache = semantic_cache
+        self.cache = ResponseCache()
+        # When set, response text is written here as it arrives from the model
+        self.stream_output: Optional[TextIO] = None
+        self.streamed = False
+        self._aclient = None
+    
+    @property
+    def session(self):
+        """HTTP session used for Ollama requests (the shared pool by default)"""
+        if self._session is None:
+            self._session = _get_session()
+        return self._session
+    
+    @session.setter
+    def session(self, value):
+        self._session = value
+    
+    def _token_budget(self, action: str) -> int:
+        """num_predict for an action, capped by the helper's max_tokens"""
+        return min(self._ACTION_TOKEN_BUDGET.get(action, self.max_tokens), self.max_tokens)
+    
+    @timed('call_api')
+    def call_api(self, prompt: str, temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None, action: Optional[str] = None) -> str:
+        """Call Olympus Coder API with the given prompt.
+
+        ``action`` names the kind of request; semantic cache hits are only
+        taken from earlier requests with the same action and options.
+        """
+        temp = temperature if temperature is not None else self.temperature
+        num_predict = max_tokens if max_tokens is not None else self.max_tokens
+        
+        if not self.use_cache:
+            return self._generate(prompt, temp, num_predict)
+        
+        key = ResponseCache.make_key(self.model_name, temp, prompt, num_predict)
+        scope = (self.model_name, round(temp, 3), num_predict, action)
+        cached = self.cache.get(key)
+        if cached is None and self.semantic_cache:
+            embedding = self._embed(prompt)
+            if embedding:
+                cached = self.cache.get_similar(embedding, scope)
+        else:
+            embedding = None
+        
+        if cached is not None:
+            self._emit(cached)
+            return cached
+        
+        result = self._generate(prompt, temp, num_predict)
+        if not result.startswith("Error:"):
+            self.cache.put(key, result, embedding, scope)
+        return result
+    
+    async def acall_api(self, prompt: str, temperature: Optional[float] = None,
+                        max_tokens: Optional[int] = None) -> str:
+        """Async variant of call_api backed by a pooled httpx.AsyncClient"""
+        if _load_httpx() is None:
+            raise RuntimeError("httpx is required for the async API: pip install httpx")
+        
+        temp = temperature if temperature is not None else self.temperature
+        num_predict = max_tokens if max_tokens is not None else self.max_tokens
+        key = ResponseCache.make_key(self.model_name, temp, prompt, num_predict)
+        if self.use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if self._aclient is None:
+            self._aclient = httpx.AsyncClient(
+                base_url=self.ollama_url,
+                # HTTP/2 additionally needs the h2 package
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+            )
+        
+        try:
+            body, headers = self._encode_body({
+                "model": self.model_name,
+                "prompt": prompt,
+                "keep_alive": self.keep_alive,
+                "stream": False,
+                "options": self._options(temp, num_predict)
+            })
+            response = await self._aclient.post("/api/generate", content=body, headers=headers)
+            
+            if response.status_code != 200:
+                return f"Error: HTTP {response.status_code} - {response.text}"
+            result = _json_loads(response.content).get('response', '')
+        except httpx.ConnectError:
+            return "Error: Cannot connect to Ollama. Make sure it's running on " + self.ollama_url
+        except httpx.TimeoutException:
+            return "Error: Request timed out. The model might be processing a complex request."
+        except Exception as e:
+            return f"Error: {str(e)}"
+        
+        if self.use_cache:
+            self.cache.put(key, result)
+        return result
+    
+    async def aclose(self):
+        """Close the async client's pooled connections"""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+    
+    def call_api_many(self, prompts: List[str], temperature: Optional[float] = None,
+                      max_tokens: Optional[int] = None) -> List[str]:
+        """Run several independent prompts, concurrently when httpx is installed"""
+        if _load_httpx() is None:
+            return [self.call_api(prompt, temperature, max_tokens) for prompt in prompts]
+        
+        import asyncio
+        
+        async def run_all():
+            try:
+                return await asyncio.gather(
+                    *(self.acall_api(p, temperature, max_tokens) for p in prompts)
+                )
+            finally:
+                await self.aclose()
+        
+        return list(asyncio.run(run_all()))
+    
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        """Fetch the prompt embedding for the semantic cache tier"""
+        try:
+            response = self.session.post(f"{self.ollama_url}/api/embeddings", data=_json_dumps({
+                "model": self.model_name,
+                "prompt": prompt
+            }), headers=_JSON_HEADERS, timeout=10)
+            if response.status_code == 200:
+                return _json_loads(response.content).get('embedding') or None
+        except Exception:
+            pass
+        return None
+    
+    def _options(self, temp: float, num_predict: int) -> Dict[str, Any]:
+        """Model options for one request.
+
+        Built per call so later changes to ``temperature`` or ``max_tokens``
+        on the helper take effect.
+        """
+        return {"temperature": temp, "num_predict": num_predict}
+    
+    def _encode_body(self, payload: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize a request body, gzip-compressing large ones when enabled"""
+        body = _json_dumps(payload)
+        if self.compress_requests and len(body) >= GZIP_MIN_BYTES:
+            return gzip.compress(body, compresslevel=1), _GZIP_JSON_HEADERS
+        return body, _JSON_HEADERS
+    
+    def _emit(self, text: str):
+        """Write response text to the stream output, if any"""
+        if self.stream_output is not None and text:
+            self.stream_output.write(text)
+            self.stream_output.flush()
+            self.streamed = True
+    
+    def _generate(self, prompt: str, temp: float, num_predict: int) -> str:
+        """Send a generate request to Ollama"""
+        stream = self.stream_output is not None
+        # Also needed when a session was injected and _get_session never ran
+        exceptions = _load_requests().exceptions
+        try:
+            body, headers = self._encode_body({
+                "model": self.model_name,
+                "prompt": prompt,
+                "keep_alive": self.keep_alive,
+                "stream": stream,
+                "options": self._options(temp, num_predict)
+            })
+            response = self.session.post(f"{self.ollama_url}/api/generate", data=body, headers=headers,
+                                         stream=stream, timeout=(5, self.timeout) if stream else self.timeout)
+            
+            if response.status_code != 200:
+                return f"Error: HTTP {response.status_code} - {response.text}"
+            
+            if not stream:
+                data = _json_loads(response.content)
+                return data.get('response', '')
+            
+            # Relay each NDJSON chunk as soon as it arrives
+            parts = []
+            for raw in response.iter_lines():
+                if not raw:
+                    continue
+                chunk = _json_loads(raw)
+                if 'error' in chunk:
+                    return f"Error: {chunk['error']}"
+                text = chunk.get('response', '')
+                parts.append(text)
+                self._emit(text)
+                if chunk.get('done'):
+                    break
+            return ''.join(parts)
+                
+        except exceptions.ConnectionError:
+            return "Error: Cannot connect to Ollama. Make sure it's running on " + self.ollama_url
+        except exceptions.Timeout:
+            return "Error: Request timed out. The model might be processing a complex request."
+        except Exception as e:
+            return f"Error: {str(e)}"
+    
+    def get_file_context(self, file_path: str, max_lines: int = 100) -> str:
+        """Read file content for context.
+
+        Files longer than ``max_lines`` are reduced to their first and last
+        halves. Results are cached until the file's mtime or size changes.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return f"File not found: {file_path}"
+        
+        try:
+            return _read_file_context(file_path, st.st_mtime_ns, st.st_size, max_lines)
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+    
+    def detect_language(self, file_path: str) -> str:
+        """Detect programming language from file extension"""
+        return _LANG_MAP_GET(_file_suffix(file_path).lower(), 'Unknown')
+    
+    def _file_section(self, file_path: Optional[str], file_content: Optional[str] = None) -> str:
+        """Build the per-file prompt prefix shared by every action on that file"""
+        if not file_path:
+            return ""
+        section = f"File: {file_path}\nLanguage: {self.detect_language(file_path)}\n\n"
+        if file_content is not None:
+            section += f"Current file content:\n{file_content}\n\n"
+        return section
+    
+    def _selection_section(self, file_path: Optional[str]) -> str:
+        """File prefix for actions on a selection, with the file's content if configured"""
+        if file_path and self.selection_file_context:
+            return self._file_section(file_path, self.get_file_context(file_path))
+        return self._file_section(file_path)
+    
+    @timed('generate')
+    def generate_code(self, prompt: str, file_path: Optional[str] = None) -> str:
+        """Generate code based on prompt and optional file context"""
+        context = ""
+        if file_path:
+            context = self._file_section(file_path, self.get_file_context(file_path))
+        
+        full_prompt = f"{context}{GENERATE_INSTRUCTIONS}{REQUEST_SEPARATOR}Request: {prompt}"
+        
+        return self.call_api(full_prompt, max_tokens=self._token_budget('generate'),
+                             action='generate')
+    
+    @timed('debug')
+    def debug_code(self, code: Optional[str] = None, file_path: Optional[str] = None) -> str:
+        """Debug the given code, or the whole file when no code is given"""
+        if file_path and not (code and code.strip()):
+            code = self.get_file_context(file_path)
+        
+        if not code:
+            return "Error: No code provided to debug"
+        
+        prompt = f"{self._file_section(file_path)}{DEBUG_INSTRUCTIONS}{REQUEST_SEPARATOR}Code to debug:\n{code}"
+        
+        return self.call_api(prompt, temperature=0.05, max_tokens=self._token_budget('debug'),
+                             action='debug')
+    
+    @timed('explain')
+    def explain_code(self, code: str, file_path: Optional[str] = None) -> str:
+        """Explain what the code does"""
+        if not code or not code.strip():
+            return "Error: No code provided to explain"
+        
+        prompt = f"{self._selection_section(file_path)}{EXPLAIN_INSTRUCTIONS}{REQUEST_SEPARATOR}Code to explain:\n{code}"
+        
+        return self.call_api(prompt, temperature=0.2, max_tokens=self._token_budget('explain'),
+                             action='explain')
+    
+    @timed('refactor')
+    def refactor_code(self, code: str, file_path: Optional[str] = None) -> str:
+        """Refactor code for better quality"""
+        if not code or not code.strip():
+            return "Error: No code provided to refactor"
+        
+        prompt = f"{self._selection_section(file_path)}{REFACTOR_INSTRUCTIONS}{REQUEST_SEPARATOR}Code to refactor:\n{code}"
+        
+        return self.call_api(prompt, max_tokens=self._token_budget('refactor'), action='refactor')
+    
+    def _test_framework(self, file_path: Optional[str]) -> str:
+        """Pick the test framework for the file's language"""
+        if not file_path:
+            return 'appropriate testing framework'
+        return _TEST_FRAMEWORKS.get(self.detect_language(file_path), 'appropriate testing framework')
+    
+    @timed('test')
+    def generate_tests(self, code: Optional[str] = None, file_path: Optional[str] = None) -> str:
+        """Generate tests for the given code, or the whole file when no code is given"""
+        if file_path:
+            if not (code and code.strip()):
+                code = self.get_file_context(file_path)
+            language = self.detect_language(file_path)
+            framework = self._test_framework(file_path)
+            context = f"File: {file_path}\nLanguage: {language}\nTest Framework: {framework}\n\n"
+        else:
+            context = ""
+            framework = "appropriate testing framework"
+        
+        if not code:
+            return "Error: No code provided to generate tests for"
+        
+        instructions = TEST_INSTRUCTIONS.format(framework=framework)
+        prompt = f"{context}{instructions}{REQUEST_SEPARATOR}Code to test:\n{code}"
+        
+        return self.call_api(prompt, max_tokens=self._token_budget('test'), action='test')
+    
+    @timed('batch')
+    def batch(self, actions: List[str], code: Optional[str] = None,
+              file_path: Optional[str] = None) -> Dict[str, str]:
+        """Run several code actions on the same code with a single model request.
+
+        The shared context is sent and prefilled once; the model answers every
+        action under its own marker and the reply is split back per action.
+        Raises ValueError when no actions are given or one cannot be batched.
+        """
+        if not actions:
+            raise ValueError("At least one action is required for batch")
+        unknown = [a for a in actions if a not in BATCH_SECTIONS]
+        if unknown:
+            raise ValueError(f"Actions cannot be batched: {', '.join(unknown)}")
+        
+        if file_path and not code:
+            code = self.get_file_context(file_path)
+        if not code:
+            return {action: "Error: No code provided" for action in actions}
+        
+        framework = self._test_framework(file_path)
+        tasks = []
+        for action in actions:
+            marker, instructions = BATCH_SECTIONS[action]
+            tasks.append(f"{marker}\n{instructions.format(framework=framework)}")
+        
+        prompt = (
+            f"{self._file_section(file_path)}"
+            "Complete each task below for the same code. Start each answer on its own line "
+            "with the task's marker, in the order given.\n\n"
+            + "\n\n".join(tasks)
+            + f"{REQUEST_SEPARATOR}Code:\n{code}"
+        )
+        
+        # Each section gets its own budget
+        response = self.call_api(prompt, max_tokens=sum(self._token_budget(a) for a in actions),
+                                 action="batch:" + ",".join(actions))
+        if response.startswith("Error:"):
+            return {action: response for action in actions}
+        return self._split_batch_response(response, actions)
+    
+    @staticmethod
+    def _split_batch_response(response: str, actions: List[str]) -> Dict[str, str]:
+        """Split a batched reply on the section markers"""
+        positions = []
+        for action in actions:
+            marker = BATCH_SECTIONS[action][0]
+            index = response.find(marker)
+            if index >= 0:
+                positions.append((index, len(marker), action))
+        positions.sort()
+        
+        sections = {}
+        for i, (index, marker_length, action) in enumerate(positions):
+            end = positions[i + 1][0] if i + 1 < len(positions) else len(response)
+            sections[action] = response[index + marker_length:end].strip()
+        
+        return {
+            action: sections.get(action, f"Error: No {BATCH_SECTIONS[action][0]} section in model response")
+            for action in actions
+        }
+    
+    @timed('chat')
+    def chat(self, message: str, file_path: Optional[str] = None) -> str:
+        """Chat with AI about code"""
+        context = ""
+        if file_path:
+            context = self._file_section(file_path, self.get_file_context(file_path))
+        
+        prompt = f"{context}{CHAT_INSTRUCTIONS}{REQUEST_SEPARATOR}Question: {message}"
+        
+        return self.call_api(prompt, temperature=0.2, max_tokens=self._token_budget('chat'),
+                             action='chat')
+    
+    def warm(self) -> str:
+        """Load the model and pin it in memory for ``keep_alive``.
+
+        Sending an empty prompt makes Ollama load the model without generating,
+        so the first real request does not pay the cold-load cost.
+        """
+        try:
+            response = self.session.post(f"{self.ollama_url}/api/generate", data=_json_dumps({
+                "model": self.model_name,
+                "prompt": "",
+                "keep_alive": self.keep_alive,
+                "options": {"num_predict": 1}
+            }), headers=_JSON_HEADERS, timeout=(5, 120))
+            if response.status_code == 200:
+                return f"✅ {self.model_name} loaded (keep_alive={self.keep_alive})"
+            return f"❌ Could not load {self.model_name}: HTTP {response.status_code}"
+        except Exception as e:
+            return f"❌ Cannot connect to Ollama: {str(e)}"
+    
+    def health_check(self) -> str:
+        """Check if Olympus Coder is available"""
+        try:
+            response = self.session.get(f"{self.ollama_url}/api/tags", timeout=5)
+            if response.status_code == 200:
+                models = response.json().get('models', [])
+                model_names = [m.get('name', '') for m in models]
+                
+                if self.model_name in model_names:
+                    return f"✅ Olympus Coder is available at {self.ollama_url}"
+                else:
+                    available = ', '.join(model_names) if model_names else 'None'
+                    return f"❌ Model '{self.model_name}' not found. Available models: {available}"
+            else:
+                return f"❌ Ollama server error: HTTP {response.status_code}"
+        except Exception as e:
+            return f"❌ Cannot connect to Ollama: {str(e)}"
+
+ACTIONS = ['generate', 'debug', 'explain', 'refactor', 'test', 'chat', 'health', 'batch', 'warm', 'metrics']
+
+
+def run_action(helper: BaseHelper,
+               action: str,
+               prompt: Optional[str] = None,
+               text: Optional[str] = None,
+               file_path: Optional[str] = None,
+               batch_actions: Optional[List[str]] = None) -> str:
+    """Dispatch a single action and return its result.
+
+    Raises ValueError when the arguments required by the action are missing.
+    """
+    if action == 'generate':
+        if not prompt:
+            raise ValueError("Prompt required for generate action")
+        return helper.generate_code(prompt, file_path)
+    
+    elif action == 'debug':
+        return helper.debug_code(text, file_path)
+    
+    elif action == 'explain':
+        if not text:
+            raise ValueError("Code text required for explain action")
+        return helper.explain_code(text, file_path)
+    
+    elif action == 'refactor':
+        if not text:
+            raise ValueError("Code text required for refactor action")
+        return helper.refactor_code(text, file_path)
+    
+    elif action == 'test':
+        return helper.generate_tests(text, file_path)
+    
+    elif action == 'chat':
+        if not prompt:
+            raise ValueError("Prompt required for chat action")
+        return helper.chat(prompt, file_path)
+    
+    elif action == 'health':
+        return helper.health_check()
+    
+    elif action == 'warm':
+        return helper.warm()
+    
+    elif action == 'metrics':
+        return json.dumps(metrics_snapshot(), indent=2)
+    
+    elif action == 'batch':
+        if not batch_actions:
+            raise ValueError("--actions required for batch action")
+        results = helper.batch(batch_actions, text, file_path)
+        return "\n\n".join(f"=== {name} ===\n{output}" for name, output in results.items())
+    
+    raise ValueError(f"Unknown action: {action}")
+
+
+def serve_daemon(helper: BaseHelper):
+    """Serve newline-delimited JSON requests from stdin until EOF.
+
+    Each request is an object such as
+    {"id": 1, "action": "explain", "text": "...", "file": "main.py"}
+    and is answered with one JSON line {"id": 1, "result": "..."} or
+    {"id": 1, "error": "..."}. A batch request lists its actions, e.g.
+    {"id": 2, "action": "batch", "actions": ["debug", "test"], "text": "..."},
+    and its result is an object keyed by action, as is the result of
+    {"action": "metrics"} (latency percentiles per operation). Keeping the
+    process alive lets the IDE pay interpreter start-up once and reuse the
+    pooled connection to Ollama.
+    """
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        request_id = None
+        try:
+            request = _json_loads(line)
+            request_id = request.get('id')
+            if request.get('action') == 'batch':
+                result = helper.batch(request.get('actions') or [],
+                                      request.get('text'), request.get('file'))
+            elif request.get('action') == 'metrics':
+                result = metrics_snapshot()
+            else:
+                result = run_action(
+                    helper,
+                    request.get('action'),
+                    prompt=request.get('prompt'),
+                    text=request.get('text'),
+                    file_path=request.get('file')
+                )
+            reply = {"id": request_id, "result": result}
+        except (ValueError, AttributeError) as e:
+            reply = {"id": request_id, "error": str(e)}
+        
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
@@ -10,7 +10,7 @@ from .ollama_client import (
     ModelResponse, GenerateRequest, create_client_from_config
 )
 from .agentic_adapter import (
-    AgenticAdapter, AgentContext, AgentResponse, AgentState,
+    AgenticAdapter, AgentContext, AgentResponse, AgentState, ConversationHistory,
     create_default_adapter, create_context_from_task
 )
 from .logging_tools import (
@@ -38,6 +38,7 @@ __all__ = [
     "AgentContext",
     "AgentResponse",
     "AgentState",
+    "ConversationHistory",
     "create_default_adapter",
     "create_context_from_task",
     
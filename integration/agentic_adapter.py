@@ -5,26 +5,156 @@ Provides adapter functions for common agentic framework patterns,
 context passing, state management, and logging utilities.
 """
 
-import json
+import copy
+import hashlib
 import logging
+import os
+import sys
+import threading
 import time
-from typing import Dict, Any, Optional, List, Union, Callable
+from array import array
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple, Union, Callable, Deque, ClassVar
 from dataclasses import dataclass, field
-from enum import Enum
-from pathlib import Path
+from types import MappingProxyType
+from weakref import WeakValueDictionary
 
 from .ollama_client import OllamaClient, ModelResponse
-from .utils import format_context, parse_tool_response, ToolRequest, validate_tool_request
+from .utils import format_context, parse_tool_response, ToolRequest, validate_tool_request, orjson
 
+# Placed between the formatted context and the user's request
+REQUEST_SEPARATOR = "\n\n## Request\n"
 
-class AgentState(Enum):
-    """Agent execution states"""
-    IDLE = "idle"
-    THINKING = "thinking"
-    ACTING = "acting"
-    WAITING = "waiting"
-    ERROR = "error"
-    COMPLETE = "complete"
+# File contents at least this long are shared between AgentContexts
+SHARED_CONTENT_MIN_LENGTH = 1024
+
+# File extension (without the dot) -> language for AgentContext.add_file
+_EXTENSION_MAP = {
+    "py": "python",
+    "js": "javascript",
+    "ts": "typescript",
+    "java": "java",
+    "cpp": "cpp",
+    "c": "c"
+}
+
+
+# Message keys ConversationHistory stores in its own columns
+_MESSAGE_COLUMNS = frozenset(("role", "content", "timestamp"))
+_NO_TIMESTAMP = float("nan")
+
+
+class AgentState:
+    """Agent execution states.
+    
+    Plain interned strings rather than an Enum. Compare with == / !=:
+    str equality checks identity first, so comparing interned values is as
+    cheap as ``is``, and states loaded from JSON or built at runtime still
+    compare correctly.
+    """
+    IDLE = sys.intern("idle")
+    THINKING = sys.intern("thinking")
+    ACTING = sys.intern("acting")
+    WAITING = sys.intern("waiting")
+    ERROR = sys.intern("error")
+    COMPLETE = sys.intern("complete")
+
+
+class ConversationHistory:
+    """
+    Conversation messages stored column-wise.
+    
+    Roles (only a handful of distinct values) are interned, contents are kept
+    in a list and timestamps in a float array (NaN when a message has none).
+    Any other keys (e.g. name, tool_call_id) go to a per-message extras dict,
+    which stays None for ordinary messages.
+    
+    Indexing and iteration build the familiar {"role", "content",
+    "timestamp", ...} mappings on demand. They are read-only views: assigning
+    to one raises TypeError instead of silently changing a throwaway copy.
+    to_list() returns plain dicts.
+    """
+    
+    __slots__ = ("roles", "contents", "timestamps", "extras")
+    
+    def __init__(self, messages: Optional[List[Dict[str, Any]]] = None):
+        self.roles: List[str] = []
+        self.contents: List[str] = []
+        self.timestamps = array('d')
+        self.extras: List[Optional[Dict[str, Any]]] = []
+        for message in messages or ():
+            self.append(message)
+    
+    def add(self, role: str, content: str, timestamp: float,
+            extras: Optional[Dict[str, Any]] = None):
+        """Append one message"""
+        self.roles.append(sys.intern(role))
+        self.contents.append(content)
+        self.timestamps.append(timestamp)
+        self.extras.append(extras or None)
+    
+    def append(self, message: Dict[str, Any]):
+        """Append a message given as a dict, keeping any extra keys"""
+        extras = {key: value for key, value in message.items()
+                  if key not in _MESSAGE_COLUMNS}
+        timestamp = message.get("timestamp", _NO_TIMESTAMP)
+        if type(timestamp) not in (float, int):
+            # Kept verbatim (e.g. None) rather than coerced into the array
+            if "timestamp" in message:
+                extras["timestamp"] = timestamp
+            timestamp = _NO_TIMESTAMP
+        self.add(
+            message.get("role", "unknown"),
+            message.get("content", ""),
+            timestamp,
+            extras
+        )
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialize all messages as dicts"""
+        return [self._message(i) for i in range(len(self.roles))]
+    
+    def _message(self, index: int) -> Dict[str, Any]:
+        """Build the dict for one message"""
+        message = {"role": self.roles[index], "content": self.contents[index]}
+        timestamp = self.timestamps[index]
+        if timestamp == timestamp:  # not NaN
+            message["timestamp"] = timestamp
+        extras = self.extras[index]
+        if extras:
+            message.update(extras)
+        return message
+    
+    def __len__(self) -> int:
+        return len(self.roles)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.roles)))]
+        if index < 0:
+            index += len(self.roles)
+        if not 0 <= index < len(self.roles):
+            raise IndexError("conversation history index out of range")
+        return MappingProxyType(self._message(index))
+    
+    def __iter__(self):
+        for index in range(len(self.roles)):
+            yield MappingProxyType(self._message(index))
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ConversationHistory):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"ConversationHistory({self.to_list()!r})"
+
+
+class _SharedText(str):
+    """str that AgentContext's content pool can reference weakly"""
+    __slots__ = ("__weakref__",)
 
 
 @dataclass
@@ -39,42 +169,70 @@ class AgentContext:
     files: List[Dict[str, str]] = field(default_factory=list)
     project_structure: Optional[Dict[str, Any]] = None
     error_context: Optional[str] = None
-    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    conversation_history: ConversationHistory = field(default_factory=ConversationHistory)
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: float = field(default_factory=time.time)
     updated_at: float = field(default_factory=time.time)
+    # format_context() output without the conversation, and what it was built from
+    _cached_format: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _cached_format_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
-    def add_message(self, role: str, content: str):
-        """Add message to conversation history"""
-        self.conversation_history.append({
-            "role": role,
-            "content": content,
-            "timestamp": time.time()
-        })
-        self.updated_at = time.time()
+    # Content hash -> file content, shared by every context while in use
+    _content_pool: ClassVar["WeakValueDictionary[bytes, _SharedText]"] = WeakValueDictionary()
     
-    def add_file(self, path: str, content: str, language: Optional[str] = None):
+    def __post_init__(self):
+        # Accept plain message lists, e.g. from from_dict()
+        if not isinstance(self.conversation_history, ConversationHistory):
+            self.conversation_history = ConversationHistory(self.conversation_history)
+    
+    def add_message(self, role: str, content: str, now: Optional[float] = None):
+        """Add message to conversation history
+        
+        ``now`` lets callers adding several entries at once share one clock read.
+        """
+        if now is None:
+            now = time.time()
+        self.conversation_history.add(role, content, now)
+        self.updated_at = now
+    
+    def add_file(self, path: str, content: str, language: Optional[str] = None,
+                 now: Optional[float] = None):
         """Add file to context"""
+        if now is None:
+            now = time.time()
+        if len(content) >= SHARED_CONTENT_MIN_LENGTH:
+            content = self._shared_content(content)
         file_info = {
             "path": path,
             "content": content,
             "language": language or self._detect_language(path),
-            "added_at": time.time()
+            "added_at": now
         }
         self.files.append(file_info)
-        self.updated_at = time.time()
+        self.updated_at = now
+    
+    @classmethod
+    def _shared_content(cls, content: str) -> str:
+        """Return the pooled copy of ``content``, so identical files are stored once"""
+        key = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        shared = cls._content_pool.get(key)
+        if shared is None:
+            shared = _SharedText(content)
+            cls._content_pool[key] = shared
+        return shared
     
-    def set_error(self, error_message: str, traceback: Optional[str] = None):
+    def set_error(self, error_message: str, traceback: Optional[str] = None,
+                  now: Optional[float] = None):
         """Set error context"""
         self.error_context = error_message
         if traceback:
             self.error_context += f"\n\nTraceback:\n{traceback}"
-        self.updated_at = time.time()
+        self.updated_at = time.time() if now is None else now
     
-    def clear_error(self):
+    def clear_error(self, now: Optional[float] = None):
         """Clear error context"""
         self.error_context = None
-        self.updated_at = time.time()
+        self.updated_at = time.time() if now is None else now
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert context to dictionary"""
@@ -85,12 +243,48 @@ class AgentContext:
             "files": self.files,
             "project_structure": self.project_structure,
             "error_context": self.error_context,
-            "conversation_history": self.conversation_history,
+            "conversation_history": self.conversation_history.to_list(),
             "metadata": self.metadata,
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
     
+    def formatted_context(self) -> str:
+        """
+        Return format_context() output for this context.
+        
+        Every turn adds messages, so only the recent-conversation section is
+        rebuilt each call; the task, project structure, files and error
+        sections are cached until one of them changes.
+        
+        Changes are detected by value, including in-place edits: the key
+        holds each file's current (field, value) pairs and a copy of the
+        project structure. Comparing them is cheap because unchanged values
+        are the same objects as last time.
+        """
+        key = (
+            self.task_description,
+            self.error_context,
+            tuple(tuple(file_info.items()) for file_info in self.files),
+            self.project_structure
+        )
+        if self._cached_format_key != key:
+            self._cached_format = format_context(
+                files=self.files,
+                project_structure=self.project_structure,
+                current_task=self.task_description,
+                error_context=self.error_context
+            )
+            # Snapshot the structure so later in-place edits are noticed
+            self._cached_format_key = key[:3] + (copy.deepcopy(self.project_structure),)
+        
+        recent = format_context(conversation_history=self.conversation_history)
+        if not recent:
+            return self._cached_format
+        if not self._cached_format:
+            return recent
+        return f"{self._cached_format}\n{recent}"
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AgentContext":
         """Create context from dictionary"""
@@ -98,15 +292,8 @@ class AgentContext:
     
     def _detect_language(self, file_path: str) -> str:
         """Detect language from file extension"""
-        extension_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".java": "java",
-            ".cpp": "cpp",
-            ".c": "c"
-        }
-        return extension_map.get(Path(file_path).suffix, "text")
+        _, dot, extension = file_path.rpartition('.')
+        return _EXTENSION_MAP.get(extension.lower(), "text") if dot else "text"
 
 
 @dataclass
@@ -118,7 +305,7 @@ class AgentResponse:
     content: str
     tool_request: Optional[ToolRequest] = None
     confidence: float = 1.0
-    state: AgentState = AgentState.COMPLETE
+    state: str = AgentState.COMPLETE
     execution_time: Optional[float] = None
     token_count: Optional[int] = None
     error: Optional[str] = None
@@ -131,6 +318,65 @@ class AgentResponse:
     def is_successful(self) -> bool:
         """Check if response indicates successful execution"""
         return self.error is None and self.state != AgentState.ERROR
+    
+    def reset(
+        self,
+        content: str,
+        tool_request: Optional[ToolRequest] = None,
+        confidence: float = 1.0,
+        state: str = AgentState.COMPLETE,
+        execution_time: Optional[float] = None,
+        token_count: Optional[int] = None,
+        error: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> "AgentResponse":
+        """Reinitialize every field in place, reusing the metadata dict"""
+        self.content = content
+        self.tool_request = tool_request
+        self.confidence = confidence
+        self.state = state
+        self.execution_time = execution_time
+        self.token_count = token_count
+        self.error = error
+        current = getattr(self, "metadata", None)
+        if current is None:
+            self.metadata = dict(metadata) if metadata else {}
+        else:
+            current.clear()
+            if metadata:
+                current.update(metadata)
+        return self
+    
+    def release(self):
+        """
+        Return this response to the pool used by AgenticAdapter.execute_task.
+        
+        Optional; call it only once the response (and its metadata dict) is no
+        longer referenced. Error responses are never pooled.
+        """
+        if not self.is_successful():
+            return
+        
+        # Drop references to the model response and tool request
+        self.reset("")
+        with _response_pool_lock:
+            if len(_response_pool) < _RESPONSE_POOL_SIZE and \
+                    not any(pooled is self for pooled in _response_pool):
+                _response_pool.append(self)
+
+
+# Released AgentResponse instances, reused by AgenticAdapter.execute_task
+_RESPONSE_POOL_SIZE = 64
+_response_pool: List[AgentResponse] = []
+_response_pool_lock = threading.Lock()
+
+
+def _acquire_response() -> AgentResponse:
+    """Take a released AgentResponse from the pool, or allocate a blank one"""
+    with _response_pool_lock:
+        if _response_pool:
+            return _response_pool.pop()
+    return AgentResponse.__new__(AgentResponse)
 
 
 class AgenticAdapter:
@@ -141,6 +387,18 @@ class AgenticAdapter:
     and tool execution coordination.
     """
     
+    # Shape of every execution_history entry; copying it is cheaper than
+    # building the same seven-key dict literal for each execution
+    _LOG_TEMPLATE = {
+        "task_id": None,
+        "prompt_length": 0,
+        "response_length": 0,
+        "execution_time": 0.0,
+        "success": False,
+        "has_tool_request": False,
+        "timestamp": 0.0
+    }
+    
     def __init__(
         self,
         ollama_client: OllamaClient,
@@ -168,13 +426,35 @@ class AgenticAdapter:
         
         # State management
         self.active_contexts: Dict[str, AgentContext] = {}
-        self.execution_history: List[Dict[str, Any]] = []
+        # Bounded to the last 1000 executions; deque evicts the oldest in O(1).
+        # The setter also resets the running totals used by get_execution_stats.
+        self.execution_history = []
+        
+        # (tool name, parameter names) -> errors that depend only on those
+        self._validation_cache: Dict[Tuple[str, frozenset], Tuple[str, ...]] = {}
         
         # Tool execution hooks
         self.tool_handlers: Dict[str, Callable] = {}
         self.pre_execution_hooks: List[Callable] = []
         self.post_execution_hooks: List[Callable] = []
     
+    @property
+    def execution_history(self) -> Deque[Dict[str, Any]]:
+        """Most recent executions, oldest first"""
+        return self._execution_history
+    
+    @execution_history.setter
+    def execution_history(self, entries):
+        self._execution_history: Deque[Dict[str, Any]] = deque(entries, maxlen=1000)
+        self._success_count = sum(
+            1 for exec_info in self._execution_history
+            if exec_info.get("success", False)
+        )
+        self._total_time = sum(
+            exec_info.get("execution_time") or 0
+            for exec_info in self._execution_history
+        )
+    
     def execute_task(
         self,
         context: AgentContext,
@@ -194,63 +474,33 @@ class AgenticAdapter:
         Returns:
             AgentResponse with generated content and tool requests
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Store context
             self.active_contexts[context.task_id] = context
             
-            # Run pre-execution hooks
-            for hook in self.pre_execution_hooks:
-                hook(context, prompt)
-            
-            # Format context for model
-            formatted_context = format_context(
-                files=context.files,
-                project_structure=context.project_structure,
-                current_task=context.task_description,
-                error_context=context.error_context,
-                conversation_history=context.conversation_history
-            )
-            
-            # Combine context with prompt
-            full_prompt = f"{formatted_context}\n\n## Request\n{prompt}"
+            # Run pre-execution hooks (usually none are registered)
+            if self.pre_execution_hooks:
+                for hook in self.pre_execution_hooks:
+                    hook(context, prompt)
             
-            # Truncate if too long
-            if len(full_prompt) > self.max_context_length:
-                full_prompt = self._truncate_context(full_prompt)
+            full_prompt = self._build_prompt(context, prompt)
             
             # Generate response
-            model_options = {**self.default_options, **(options or {})}
             model_response = self.client.generate(
                 prompt=full_prompt,
                 system_prompt=system_prompt,
-                options=model_options
-            )
-            
-            # Parse response for tool requests
-            tool_request, cleaned_content = parse_tool_response(model_response.content)
-            
-            # Create agent response
-            execution_time = time.time() - start_time
-            agent_response = AgentResponse(
-                content=cleaned_content,
-                tool_request=tool_request,
-                execution_time=execution_time,
-                token_count=model_response.eval_count,
-                metadata={
-                    "model_response": model_response,
-                    "context_length": len(full_prompt)
-                }
+                options=self._model_options(options)
             )
             
-            # Add to conversation history
-            context.add_message("user", prompt)
-            context.add_message("assistant", model_response.content)
+            agent_response = self._complete_task(context, prompt, full_prompt,
+                                                 model_response, start_time)
             
             # Run post-execution hooks
-            for hook in self.post_execution_hooks:
-                hook(context, agent_response)
+            if self.post_execution_hooks:
+                for hook in self.post_execution_hooks:
+                    hook(context, agent_response)
             
             # Log execution
             self._log_execution(context, prompt, agent_response)
@@ -258,18 +508,262 @@ class AgenticAdapter:
             return agent_response
             
         except Exception as e:
-            execution_time = time.time() - start_time
-            error_response = AgentResponse(
-                content="",
-                state=AgentState.ERROR,
-                execution_time=execution_time,
-                error=str(e)
+            return self._fail_task(context, e, start_time)
+    
+    async def execute_task_async(
+        self,
+        context: AgentContext,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> AgentResponse:
+        """
+        Async variant of execute_task.
+        
+        The model call is awaited, so several contexts can have requests in
+        flight at once. Uses ``client.agenerate`` when the client has one
+        and otherwise runs ``client.generate`` in a worker thread. Hooks
+        may be plain functions or coroutine functions; they run in the same
+        order as in execute_task.
+        
+        Args:
+            context: Agent context with task and project information
+            prompt: User prompt/request
+            system_prompt: Optional system prompt override
+            options: Model generation options
+            
+        Returns:
+            AgentResponse with generated content and tool requests
+        """
+        # Imported here so that sync-only users do not pay for them
+        import asyncio
+        import functools
+        import inspect
+        
+        start_time = time.perf_counter()
+        
+        try:
+            # Store context
+            self.active_contexts[context.task_id] = context
+            
+            if self.pre_execution_hooks:
+                for hook in self.pre_execution_hooks:
+                    result = hook(context, prompt)
+                    if inspect.isawaitable(result):
+                        await result
+            
+            full_prompt = self._build_prompt(context, prompt)
+            
+            # Generate response without blocking the event loop
+            model_options = self._model_options(options)
+            agenerate = getattr(self.client, "agenerate", None)
+            if agenerate is not None:
+                model_response = await agenerate(
+                    prompt=full_prompt,
+                    system_prompt=system_prompt,
+                    options=model_options
+                )
+            else:
+                # run_in_executor rather than asyncio.to_thread to keep 3.8 support
+                model_response = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    functools.partial(
+                        self.client.generate,
+                        prompt=full_prompt,
+                        system_prompt=system_prompt,
+                        options=model_options
+                    )
+                )
+            
+            agent_response = self._complete_task(context, prompt, full_prompt,
+                                                 model_response, start_time)
+            
+            if self.post_execution_hooks:
+                for hook in self.post_execution_hooks:
+                    result = hook(context, agent_response)
+                    if inspect.isawaitable(result):
+                        await result
+            
+            self._log_execution(context, prompt, agent_response)
+            
+            return agent_response
+            
+        except Exception as e:
+            return self._fail_task(context, e, start_time)
+    
+    def execute_task_streaming(
+        self,
+        context: AgentContext,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_at_tool_request: bool = True
+    ) -> AgentResponse:
+        """
+        Execute a task while consuming the model output as it is generated.
+        
+        Uses ``client.generate_stream`` (an iterator of partial ModelResponse
+        chunks) when the client provides it, otherwise a single
+        ``client.generate`` call. Each piece of text is passed to
+        ``on_token``. With ``stop_at_tool_request`` the stream is closed as
+        soon as a complete tool request has been parsed, so the caller can
+        run the tool without waiting for the rest of the generation.
+        
+        Args:
+            context: Agent context with task and project information
+            prompt: User prompt/request
+            system_prompt: Optional system prompt override
+            options: Model generation options
+            on_token: Optional callback receiving each text chunk
+            stop_at_tool_request: Stop reading once a tool request is complete
+            
+        Returns:
+            AgentResponse with generated content and tool requests
+        """
+        start_time = time.perf_counter()
+        
+        try:
+            # Store context
+            self.active_contexts[context.task_id] = context
+            
+            if self.pre_execution_hooks:
+                for hook in self.pre_execution_hooks:
+                    hook(context, prompt)
+            
+            full_prompt = self._build_prompt(context, prompt)
+            request = {
+                "prompt": full_prompt,
+                "system_prompt": system_prompt,
+                "options": self._model_options(options)
+            }
+            
+            generate_stream = getattr(self.client, "generate_stream", None)
+            chunks = generate_stream(**request) if generate_stream is not None \
+                else iter((self.client.generate(**request),))
+            
+            parts: List[str] = []
+            last_chunk = None
+            stopped_early = False
+            # Only look for a tool request once its key has appeared
+            tool_key_seen = False
+            try:
+                for chunk in chunks:
+                    last_chunk = chunk
+                    text = chunk.content
+                    if not text:
+                        continue
+                    parts.append(text)
+                    if on_token is not None:
+                        on_token(text)
+                    
+                    if not stop_at_tool_request or '}' not in text:
+                        continue
+                    if not tool_key_seen:
+                        tool_key_seen = "tool_name" in "".join(parts)
+                    if tool_key_seen and parse_tool_response("".join(parts))[0] is not None:
+                        stopped_early = not chunk.done
+                        break
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    # Closing the generator closes the HTTP stream, which
+                    # stops the generation on the server
+                    close()
+            
+            model_response = ModelResponse(
+                content="".join(parts),
+                model=getattr(last_chunk, "model", None) or getattr(self.client, "model_name", ""),
+                created_at=getattr(last_chunk, "created_at", ""),
+                done=not stopped_early,
+                eval_count=getattr(last_chunk, "eval_count", None)
             )
             
-            self.logger.error(f"Task execution failed: {e}")
-            context.set_error(str(e))
+            agent_response = self._complete_task(context, prompt, full_prompt,
+                                                 model_response, start_time)
+            if stopped_early:
+                agent_response.metadata["stopped_early"] = True
             
-            return error_response
+            if self.post_execution_hooks:
+                for hook in self.post_execution_hooks:
+                    hook(context, agent_response)
+            
+            self._log_execution(context, prompt, agent_response)
+            
+            return agent_response
+            
+        except Exception as e:
+            return self._fail_task(context, e, start_time)
+    
+    def _build_prompt(self, context: AgentContext, prompt: str) -> str:
+        """Format the context and append the request"""
+        # Reuses the task, structure, file and error sections while their
+        # content is unchanged (not keyed on updated_at, which every turn bumps)
+        formatted_context = context.formatted_context()
+        
+        # Combine context with prompt, truncating only the context
+        return self._assemble_prompt(formatted_context, prompt)
+    
+    def _model_options(self, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Default model options overridden by the per-task ones.
+        
+        Without overrides the defaults dict itself is passed on, uncopied;
+        the client only reads it.
+        """
+        if not options:
+            return self.default_options
+        return {**self.default_options, **options}
+    
+    def _complete_task(
+        self,
+        context: AgentContext,
+        prompt: str,
+        full_prompt: str,
+        model_response: ModelResponse,
+        start_time: float
+    ) -> AgentResponse:
+        """Turn a model response into an AgentResponse and record the turn"""
+        # Parse response for tool requests; every tool request pattern is
+        # JSON, so plain prose can skip the parser
+        if '{' in model_response.content:
+            tool_request, cleaned_content = parse_tool_response(model_response.content)
+        else:
+            tool_request, cleaned_content = None, model_response.content
+        
+        # Create agent response
+        execution_time = time.perf_counter() - start_time
+        agent_response = _acquire_response().reset(
+            content=cleaned_content,
+            tool_request=tool_request,
+            execution_time=execution_time,
+            token_count=model_response.eval_count,
+            metadata={
+                "model_response": model_response,
+                "context_length": len(full_prompt)
+            }
+        )
+        
+        # Add to conversation history (one timestamp for the whole turn)
+        now = time.time()
+        context.add_message("user", prompt, now=now)
+        context.add_message("assistant", model_response.content, now=now)
+        
+        return agent_response
+    
+    def _fail_task(self, context: AgentContext, error: Exception, start_time: float) -> AgentResponse:
+        """Build the error response for a failed task and record the error"""
+        execution_time = time.perf_counter() - start_time
+        error_response = AgentResponse(
+            content="",
+            state=AgentState.ERROR,
+            execution_time=execution_time,
+            error=str(error)
+        )
+        
+        self.logger.error("Task execution failed: %s", error)
+        context.set_error(str(error))
+        
+        return error_response
     
     def execute_tool_request(
         self,
@@ -287,7 +781,7 @@ class AgenticAdapter:
             Tool execution result
         """
         # Validate tool request
-        is_valid, errors = validate_tool_request(tool_request)
+        is_valid, errors = self._validate_tool_request(tool_request)
         if not is_valid:
             return {
                 "success": False,
@@ -308,7 +802,8 @@ class AgenticAdapter:
             handler = self.tool_handlers[tool_request.tool_name]
             result = handler(tool_request.parameters, context)
             
-            self.logger.info(f"Tool executed successfully: {tool_request.tool_name}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Tool executed successfully: %s", tool_request.tool_name)
             
             return {
                 "success": True,
@@ -317,13 +812,40 @@ class AgenticAdapter:
             }
             
         except Exception as e:
-            self.logger.error(f"Tool execution failed: {tool_request.tool_name} - {e}")
+            self.logger.error("Tool execution failed: %s - %s", tool_request.tool_name, e)
             return {
                 "success": False,
                 "error": str(e),
                 "result": None
             }
     
+    def _validate_tool_request(self, tool_request: ToolRequest) -> Tuple[bool, List[str]]:
+        """
+        validate_tool_request with the parameter-name checks cached.
+        
+        Required parameters depend only on the tool name and the set of
+        parameter names, so that part is computed once per shape; the
+        confidence range is still checked on every call.
+        """
+        tool_name, parameters = tool_request.tool_name, tool_request.parameters
+        if not (tool_name and isinstance(tool_name, str) and isinstance(parameters, dict)):
+            return validate_tool_request(tool_request)
+        
+        key = (tool_name, frozenset(parameters))
+        schema_errors = self._validation_cache.get(key)
+        if schema_errors is None:
+            if len(self._validation_cache) >= 1024:
+                # Model output can invent arbitrary parameter names
+                self._validation_cache.clear()
+            _, errors = validate_tool_request(ToolRequest(tool_name, parameters))
+            schema_errors = self._validation_cache[key] = tuple(errors)
+        
+        if 0.0 <= tool_request.confidence <= 1.0:
+            errors = list(schema_errors)
+        else:
+            errors = ["Confidence must be between 0.0 and 1.0", *schema_errors]
+        return not errors, errors
+    
     def register_tool_handler(self, tool_name: str, handler: Callable):
         """
         Register a tool handler function.
@@ -333,7 +855,7 @@ class AgenticAdapter:
             handler: Function to handle tool execution
         """
         self.tool_handlers[tool_name] = handler
-        self.logger.info(f"Registered tool handler: {tool_name}")
+        self.logger.info("Registered tool handler: %s", tool_name)
     
     def add_pre_execution_hook(self, hook: Callable):
         """Add pre-execution hook"""
@@ -347,43 +869,67 @@ class AgenticAdapter:
         """Get context by task ID"""
         return self.active_contexts.get(task_id)
     
-    def save_context(self, context: AgentContext, file_path: str):
-        """Save context to file"""
+    def save_context(self, context: AgentContext, file_path: str, fsync: bool = False):
+        """
+        Save context to file.
+        
+        The serialized bytes go to a temporary file with unbuffered writes and
+        replace ``file_path`` atomically, so a crash never leaves a partial
+        context behind. ``fsync`` also flushes the data to disk first.
+        """
+        tmp_path = f"{file_path}.tmp"
         try:
-            with open(file_path, 'w') as f:
-                json.dump(context.to_dict(), f, indent=2)
-            self.logger.info(f"Context saved to {file_path}")
+            if orjson is not None:
+                data = orjson.dumps(context.to_dict(),
+                                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                import json
+                data = json.dumps(context.to_dict(), indent=2).encode('utf-8')
+            
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, file_path)
+            self.logger.info("Context saved to %s", file_path)
         except Exception as e:
-            self.logger.error(f"Failed to save context: {e}")
+            self.logger.error("Failed to save context: %s", e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
     
     def load_context(self, file_path: str) -> Optional[AgentContext]:
         """Load context from file"""
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            if orjson is not None:
+                data = orjson.loads(raw)
+            else:
+                import json
+                data = json.loads(raw)
             context = AgentContext.from_dict(data)
             self.active_contexts[context.task_id] = context
-            self.logger.info(f"Context loaded from {file_path}")
+            self.logger.info("Context loaded from %s", file_path)
             return context
         except Exception as e:
-            self.logger.error(f"Failed to load context: {e}")
+            self.logger.error("Failed to load context: %s", e)
             return None
     
     def get_execution_stats(self) -> Dict[str, Any]:
-        """Get execution statistics"""
-        if not self.execution_history:
+        """Get execution statistics (O(1): totals are kept by _log_execution)"""
+        if not self._execution_history:
             return {"total_executions": 0}
         
-        total_executions = len(self.execution_history)
-        successful_executions = sum(
-            1 for exec_info in self.execution_history 
-            if exec_info.get("success", False)
-        )
-        
-        total_time = sum(
-            exec_info.get("execution_time", 0) 
-            for exec_info in self.execution_history
-        )
+        total_executions = len(self._execution_history)
+        successful_executions = self._success_count
+        total_time = self._total_time
         
         avg_time = total_time / total_executions if total_executions > 0 else 0
         
@@ -395,20 +941,31 @@ class AgenticAdapter:
             "total_execution_time": total_time
         }
     
-    def _truncate_context(self, context: str) -> str:
+    def _assemble_prompt(self, formatted_context: str, prompt: str) -> str:
+        """Append the request to the context, fitting it within max length.
+        
+        Only the context is truncated; the request itself is always kept.
+        """
+        budget = self.max_context_length - len(REQUEST_SEPARATOR) - len(prompt)
+        if len(formatted_context) > budget:
+            formatted_context = self._truncate_context(formatted_context, max(budget, 0))
+        return "".join((formatted_context, REQUEST_SEPARATOR, prompt))
+    
+    def _truncate_context(self, context: str, max_length: Optional[int] = None) -> str:
         """Truncate context to fit within max length"""
-        if len(context) <= self.max_context_length:
+        if max_length is None:
+            max_length = self.max_context_length
+        if len(context) <= max_length:
             return context
         
-        # Keep the end of the context (most recent information)
-        truncated = context[-self.max_context_length:]
+        # Keep the end of the context (most recent information), starting at
+        # a line break; searching in place avoids copying the tail twice
+        start = len(context) - max_length
+        newline_pos = context.find('\n', start)
+        if newline_pos > start:
+            start = newline_pos + 1
         
-        # Find a good break point (start of a line)
-        newline_pos = truncated.find('\n')
-        if newline_pos > 0:
-            truncated = truncated[newline_pos + 1:]
-        
-        return f"[Context truncated...]\n{truncated}"
+        return "[Context truncated...]\n" + context[start:]
     
     def _log_execution(
         self,
@@ -417,21 +974,27 @@ class AgenticAdapter:
         response: AgentResponse
     ):
         """Log execution details"""
-        execution_info = {
-            "task_id": context.task_id,
-            "prompt_length": len(prompt),
-            "response_length": len(response.content),
-            "execution_time": response.execution_time,
-            "success": response.is_successful(),
-            "has_tool_request": response.has_tool_request(),
-            "timestamp": time.time()
-        }
+        execution_info = self._LOG_TEMPLATE.copy()
+        execution_info["task_id"] = context.task_id
+        execution_info["prompt_length"] = len(prompt)
+        execution_info["response_length"] = len(response.content)
+        execution_info["execution_time"] = response.execution_time
+        execution_info["success"] = response.is_successful()
+        execution_info["has_tool_request"] = response.tool_request is not None
+        execution_info["timestamp"] = time.time()
         
-        self.execution_history.append(execution_info)
+        history = self._execution_history
+        if len(history) == history.maxlen:
+            # The append below evicts the oldest entry; drop it from the totals
+            evicted = history[0]
+            if evicted.get("success", False):
+                self._success_count -= 1
+            self._total_time -= evicted.get("execution_time") or 0
         
-        # Keep only last 1000 executions
-        if len(self.execution_history) > 1000:
-            self.execution_history = self.execution_history[-1000:]
+        history.append(execution_info)
+        if execution_info["success"]:
+            self._success_count += 1
+        self._total_time += execution_info["execution_time"] or 0
 
 
 def create_default_adapter(
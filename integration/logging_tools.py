@@ -5,21 +5,80 @@ Provides comprehensive logging, debugging, and monitoring utilities
 for agent execution and framework integration.
 """
 
+import atexit
+import gzip
 import json
 import logging
+import logging.handlers
+import os
+import shutil
+import sys
 import time
 import traceback
-from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, List, Union, Deque, Callable
+from dataclasses import dataclass, fields
 from pathlib import Path
-from datetime import datetime
 import threading
-from queue import Queue
+from collections import deque
+from itertools import islice
+from queue import Queue, SimpleQueue, Empty
 
 from .agentic_adapter import AgentContext, AgentResponse, AgentState
+from .utils import _DATACLASS_SLOTS, orjson
 
+if orjson is not None:
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+    
+    def _dumps_text(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+else:
+    def _dumps_line(obj: Any) -> bytes:
+        return (json.dumps(obj, separators=(',', ':')) + '\n').encode('utf-8')
+    
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    
+    def _dumps_text(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+# Most entries the writer thread takes off the queue per wake-up
+STRUCTURED_BATCH_SIZE = 256
+
+# Most tool names with a cached log_tool_execution body
+TOOL_LOGGER_CACHE_SIZE = 256
+
+
+def _bisect_timestamp(entries: Deque["LogEntry"], timestamp: float, lo: int, hi: int,
+                      right: bool) -> int:
+    """Binary search entries (in time order) for timestamp, like bisect_left/right"""
+    # bisect only accepts key= from Python 3.10
+    while lo < hi:
+        mid = (lo + hi) // 2
+        value = entries[mid].timestamp
+        if value < timestamp or (right and value == timestamp):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern for plain str values; anything else is returned as is"""
+    # sys.intern raises TypeError for str subclasses and non-str values
+    return sys.intern(value) if type(value) is str else value
 
-@dataclass
+
+def _format_timestamp(timestamp: float, _strftime=time.strftime, _localtime=time.localtime) -> str:
+    """Format a Unix timestamp as local 'YYYY-MM-DD HH:MM:SS.ffffff'"""
+    return "%s.%06d" % (_strftime("%Y-%m-%d %H:%M:%S", _localtime(timestamp)),
+                        int(timestamp % 1 * 1_000_000))
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LogEntry:
     """Structured log entry for agent interactions"""
     timestamp: float
@@ -31,6 +90,24 @@ class LogEntry:
     data: Optional[Dict[str, Any]] = None
     execution_time: Optional[float] = None
     error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the entry for serialization (data is not copied)"""
+        return {
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "component": self.component,
+            "event_type": self.event_type,
+            "task_id": self.task_id,
+            "message": self.message,
+            "data": self.data,
+            "execution_time": self.execution_time,
+            "error": self.error
+        }
+
+
+# Column order used by CSV exports
+LOG_ENTRY_FIELDS = tuple(f.name for f in fields(LogEntry))
 
 
 class AgentLogger:
@@ -45,7 +122,11 @@ class AgentLogger:
         log_level: str = "INFO",
         log_file: Optional[str] = None,
         structured_file: Optional[str] = None,
-        max_entries: int = 10000
+        max_entries: int = 10000,
+        log_file_max_bytes: int = 10 * 1024 * 1024,
+        log_file_backup_count: int = 5,
+        structured_max_bytes: int = 128 * 1024 * 1024,
+        structured_backup_count: int = 10
     ):
         """
         Initialize agent logger.
@@ -56,6 +137,11 @@ class AgentLogger:
             log_file: Optional log file path
             structured_file: Optional structured log file path
             max_entries: Maximum log entries to keep in memory
+            log_file_max_bytes: Size at which log_file is rotated (0 disables rotation)
+            log_file_backup_count: Number of rotated log files to keep
+            structured_max_bytes: Size at which structured_file is rotated and
+                gzipped in the background (0 disables rotation)
+            structured_backup_count: Number of gzipped structured files to keep
         """
         self.name = name
         self.max_entries = max_entries
@@ -65,22 +151,60 @@ class AgentLogger:
         self.logger.setLevel(getattr(logging, log_level.upper()))
         
         # Configure handlers
-        self._setup_handlers(log_file)
+        self._log_listener = None
+        self._queue_handler = None
+        self._setup_handlers(log_file, log_file_max_bytes, log_file_backup_count)
         
         # Structured logging
         self.structured_file = structured_file
-        self.log_entries: List[LogEntry] = []
+        # Oldest entries drop off once max_entries is reached. Entries are kept
+        # as objects: JSON is produced on the caller's thread only when a
+        # structured file is configured (see _add_log_entry) and on export,
+        # so buffer-only loggers never serialize and queries never parse.
+        self.log_entries: Deque[LogEntry] = deque(maxlen=max_entries)
         self.entry_lock = threading.Lock()
+        # False once the wall clock has gone backwards between two entries;
+        # export_logs then filters linearly instead of by binary search
+        self._entries_in_time_order = True
+        
+        # Entries are only built when something reads them
+        self._entries_enabled = bool(structured_file) or max_entries > 0
+        
+        # Raw append-only descriptor owned by the writer thread; see close()
+        self._structured_fd = None
+        self._structured_size = 0
+        self.structured_max_bytes = structured_max_bytes
+        self.structured_backup_count = structured_backup_count
+        self._compress_threads: List[threading.Thread] = []
+        if structured_file:
+            self._open_structured_file()
+        
+        # Per-tool log_tool_execution bodies; see _build_tool_logger()
+        self._tool_loggers: Dict[str, Callable[..., None]] = {}
         
         # Performance tracking
-        self.performance_metrics: Dict[str, List[float]] = {}
+        # Running count/sum/min/max of execution times per operation
+        self.performance_metrics: Dict[str, Dict[str, float]] = {}
         self.error_counts: Dict[str, int] = {}
         
-        # Async logging queue
-        self.log_queue = Queue()
+        # Async logging queue of serialized JSON lines, drained by the
+        # structured file writer thread
+        self.log_queue: SimpleQueue = SimpleQueue()
         self.async_logging = False
+        self._writer_thread = None
+        if self._structured_fd is not None:
+            self._writer_thread = threading.Thread(
+                target=self._drain_queue,
+                name=f"{name}-structured-writer",
+                daemon=True
+            )
+            self._writer_thread.start()
+            self.async_logging = True
+        
+        if self._writer_thread is not None or self._log_listener is not None:
+            atexit.register(self.close)
     
-    def _setup_handlers(self, log_file: Optional[str]):
+    def _setup_handlers(self, log_file: Optional[str], max_bytes: int, backup_count: int):
         """Set up logging handlers"""
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -91,28 +215,38 @@ class AgentLogger:
         console_handler.setFormatter(formatter)
         self.logger.addHandler(console_handler)
         
-        # File handler
+        # File handler, written from a listener thread so callers only enqueue
         if log_file:
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count
+            )
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            
+            log_records = Queue()
+            self._queue_handler = logging.handlers.QueueHandler(log_records)
+            self.logger.addHandler(self._queue_handler)
+            self._log_listener = logging.handlers.QueueListener(
+                log_records, file_handler, respect_handler_level=True
+            )
+            self._log_listener.start()
     
     def log_task_start(self, context: AgentContext, prompt: str):
         """Log task execution start"""
-        self._add_log_entry(
-            level="INFO",
-            component="task_execution",
-            event_type="task_start",
-            task_id=context.task_id,
-            message=f"Starting task: {context.task_description}",
-            data={
-                "prompt_length": len(prompt),
-                "files_count": len(context.files),
-                "has_error_context": context.error_context is not None
-            }
-        )
+        if self._entries_enabled:
+            self._add_log_entry(
+                level="INFO",
+                component="task_execution",
+                event_type="task_start",
+                task_id=context.task_id,
+                message=f"Starting task: {context.task_description}",
+                data={
+                    "prompt_length": len(prompt),
+                    "files_count": len(context.files),
+                    "has_error_context": context.error_context is not None
+                }
+            )
         
-        self.logger.info(f"Task started: {context.task_id} - {context.task_description}")
+        self.logger.info("Task started: %s - %s", context.task_id, context.task_description)
     
     def log_task_complete(
         self,
@@ -121,30 +255,33 @@ class AgentLogger:
         execution_time: float
     ):
         """Log task execution completion"""
-        self._add_log_entry(
-            level="INFO" if response.is_successful() else "ERROR",
-            component="task_execution",
-            event_type="task_complete",
-            task_id=context.task_id,
-            message=f"Task completed: {context.task_description}",
-            data={
-                "success": response.is_successful(),
-                "has_tool_request": response.has_tool_request(),
-                "response_length": len(response.content),
-                "confidence": response.confidence,
-                "state": response.state.value
-            },
-            execution_time=execution_time,
-            error=response.error
-        )
-        
-        # Track performance
-        self._track_performance("task_execution", execution_time)
+        success = response.is_successful()
+        
+        if self._entries_enabled:
+            self._add_log_entry(
+                level="INFO" if success else "ERROR",
+                component="task_execution",
+                event_type="task_complete",
+                task_id=context.task_id,
+                message=f"Task completed: {context.task_description}",
+                data={
+                    "success": success,
+                    "has_tool_request": response.has_tool_request(),
+                    "response_length": len(response.content),
+                    "confidence": response.confidence,
+                    "state": response.state
+                },
+                execution_time=execution_time,
+                error=response.error,
+                operation="task_execution"
+            )
+        else:
+            self._track_performance("task_execution", execution_time)
         
-        if response.is_successful():
-            self.logger.info(f"Task completed successfully: {context.task_id}")
+        if success:
+            self.logger.info("Task completed successfully: %s", context.task_id)
         else:
-            self.logger.error(f"Task failed: {context.task_id} - {response.error}")
+            self.logger.error("Task failed: %s - %s", context.task_id, response.error)
     
     def log_tool_execution(
         self,
@@ -155,31 +292,55 @@ class AgentLogger:
         task_id: Optional[str] = None
     ):
         """Log tool execution"""
-        success = result.get("success", False)
-        
-        self._add_log_entry(
-            level="INFO" if success else "ERROR",
-            component="tool_execution",
-            event_type="tool_execute",
-            task_id=task_id,
-            message=f"Tool executed: {tool_name}",
-            data={
-                "tool_name": tool_name,
-                "parameters": parameters,
-                "success": success,
-                "result_type": type(result.get("result")).__name__
-            },
-            execution_time=execution_time,
-            error=result.get("error")
-        )
-        
-        # Track performance
-        self._track_performance(f"tool_{tool_name}", execution_time)
-        
-        if success:
-            self.logger.info(f"Tool executed successfully: {tool_name}")
-        else:
-            self.logger.error(f"Tool execution failed: {tool_name} - {result.get('error')}")
+        log = self._tool_loggers.get(tool_name)
+        if log is None:
+            log = self._build_tool_logger(tool_name)
+        log(parameters, result, execution_time, task_id)
+    
+    def _build_tool_logger(self, tool_name: str) -> Callable[..., None]:
+        """Build and cache log_tool_execution's body with tool_name's strings bound"""
+        message = f"Tool executed: {tool_name}"
+        operation = f"tool_{tool_name}"
+        success_message = f"Tool executed successfully: {tool_name}"
+        # Used as a %-format with the error as its argument
+        failure_message = "Tool execution failed: %s - %%s" % tool_name.replace("%", "%%")
+        add_log_entry = self._add_log_entry
+        track_performance = self._track_performance
+        logger = self.logger
+        
+        def log(parameters, result, execution_time, task_id):
+            success = result.get("success", False)
+            
+            if self._entries_enabled:
+                add_log_entry(
+                    level="INFO" if success else "ERROR",
+                    component="tool_execution",
+                    event_type="tool_execute",
+                    task_id=task_id,
+                    message=message,
+                    data={
+                        "tool_name": tool_name,
+                        "parameters": parameters,
+                        "success": success,
+                        "result_type": type(result.get("result")).__name__
+                    },
+                    execution_time=execution_time,
+                    error=result.get("error"),
+                    operation=operation
+                )
+            else:
+                track_performance(operation, execution_time)
+            
+            if success:
+                logger.info(success_message)
+            else:
+                logger.error(failure_message, result.get("error"))
+        
+        # Tool names come from model output, so keep the cache bounded
+        if len(self._tool_loggers) >= TOOL_LOGGER_CACHE_SIZE:
+            self._tool_loggers.clear()
+        self._tool_loggers[tool_name] = log
+        return log
     
     def log_model_interaction(
         self,
@@ -190,22 +351,24 @@ class AgentLogger:
         task_id: Optional[str] = None
     ):
         """Log model interaction details"""
-        self._add_log_entry(
-            level="DEBUG",
-            component="model_interaction",
-            event_type="model_generate",
-            task_id=task_id,
-            message="Model generation completed",
-            data={
-                "prompt_length": prompt_length,
-                "response_length": response_length,
-                "token_count": token_count,
-                "tokens_per_second": token_count / execution_time if token_count and execution_time > 0 else None
-            },
-            execution_time=execution_time
-        )
-        
-        self._track_performance("model_generation", execution_time)
+        if self._entries_enabled:
+            self._add_log_entry(
+                level="DEBUG",
+                component="model_interaction",
+                event_type="model_generate",
+                task_id=task_id,
+                message="Model generation completed",
+                data={
+                    "prompt_length": prompt_length,
+                    "response_length": response_length,
+                    "token_count": token_count,
+                    "tokens_per_second": token_count / execution_time if token_count and execution_time > 0 else None
+                },
+                execution_time=execution_time,
+                operation="model_generation"
+            )
+        else:
+            self._track_performance("model_generation", execution_time)
     
     def log_error(
         self,
@@ -215,56 +378,68 @@ class AgentLogger:
     ):
         """Log error with full traceback"""
         error_msg = str(error)
-        error_traceback = traceback.format_exc()
-        
-        self._add_log_entry(
-            level="ERROR",
-            component=component,
-            event_type="error",
-            task_id=context.task_id if context else None,
-            message=f"Error occurred: {error_msg}",
-            data={
-                "error_type": type(error).__name__,
-                "traceback": error_traceback
-            },
-            error=error_msg
-        )
+        
+        # Formatting the traceback walks every frame, so only do it when the
+        # log line or a stored entry (buffer, structured file) will keep it
+        log_enabled = self.logger.isEnabledFor(logging.ERROR)
+        if log_enabled or self._entries_enabled:
+            error_traceback = traceback.format_exc()
+        else:
+            error_traceback = None
+        
+        if self._entries_enabled:
+            self._add_log_entry(
+                level="ERROR",
+                component=component,
+                event_type="error",
+                task_id=context.task_id if context else None,
+                message=f"Error occurred: {error_msg}",
+                data={
+                    "error_type": type(error).__name__,
+                    "traceback": error_traceback
+                },
+                error=error_msg
+            )
         
         # Track error counts
         error_type = type(error).__name__
         self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
         
-        self.logger.error(f"Error in {component}: {error_msg}\n{error_traceback}")
+        if log_enabled:
+            self.logger.error("Error in %s: %s\n%s", component, error_msg, error_traceback)
     
     def log_context_update(self, context: AgentContext, update_type: str):
         """Log context updates"""
-        self._add_log_entry(
-            level="DEBUG",
-            component="context_management",
-            event_type="context_update",
-            task_id=context.task_id,
-            message=f"Context updated: {update_type}",
-            data={
-                "update_type": update_type,
-                "files_count": len(context.files),
-                "conversation_length": len(context.conversation_history),
-                "has_error": context.error_context is not None
-            }
-        )
+        if self._entries_enabled:
+            self._add_log_entry(
+                level="DEBUG",
+                component="context_management",
+                event_type="context_update",
+                task_id=context.task_id,
+                message=f"Context updated: {update_type}",
+                data={
+                    "update_type": update_type,
+                    "files_count": len(context.files),
+                    "conversation_length": len(context.conversation_history),
+                    "has_error": context.error_context is not None
+                }
+            )
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics"""
         stats = {}
         
-        for operation, times in self.performance_metrics.items():
-            if times:
-                stats[operation] = {
-                    "count": len(times),
-                    "total_time": sum(times),
-                    "average_time": sum(times) / len(times),
-                    "min_time": min(times),
-                    "max_time": max(times)
-                }
+        with self.entry_lock:
+            snapshot = [(operation, dict(metrics)) for operation, metrics in self.performance_metrics.items()]
+        
+        for operation, metrics in snapshot:
+            stats[operation] = {
+                "count": metrics["count"],
+                "total_time": metrics["sum"],
+                "average_time": metrics["sum"] / metrics["count"],
+                "min_time": metrics["min"],
+                "max_time": metrics["max"]
+            }
         
         stats["error_counts"] = self.error_counts.copy()
         stats["total_log_entries"] = len(self.log_entries)
@@ -279,19 +454,23 @@ class AgentLogger:
         task_id: Optional[str] = None
     ) -> List[LogEntry]:
         """Get recent log entries with optional filtering"""
-        with self.entry_lock:
-            entries = self.log_entries.copy()
+        matches = []
         
-        # Apply filters
-        if level:
-            entries = [e for e in entries if e.level == level]
-        if component:
-            entries = [e for e in entries if e.component == component]
-        if task_id:
-            entries = [e for e in entries if e.task_id == task_id]
+        # Walk back from the newest entry and stop once enough have matched
+        with self.entry_lock:
+            for e in reversed(self.log_entries):
+                if level and e.level != level:
+                    continue
+                if component and e.component != component:
+                    continue
+                if task_id and e.task_id != task_id:
+                    continue
+                matches.append(e)
+                if len(matches) == count:
+                    break
         
-        # Return most recent entries
-        return entries[-count:] if count > 0 else entries
+        matches.reverse()
+        return matches
     
     def export_logs(
         self,
@@ -301,38 +480,57 @@ class AgentLogger:
         end_time: Optional[float] = None
     ):
         """Export logs to file"""
+        # Timestamps are taken under entry_lock, so entries are normally in
+        # time order and the range is located by binary search, copying only
+        # that slice
         with self.entry_lock:
-            entries = self.log_entries.copy()
-        
-        # Filter by time range
-        if start_time:
-            entries = [e for e in entries if e.timestamp >= start_time]
-        if end_time:
-            entries = [e for e in entries if e.timestamp <= end_time]
+            entries = self.log_entries
+            if self._entries_in_time_order:
+                start = 0
+                stop = len(entries)
+                if start_time:
+                    start = _bisect_timestamp(entries, start_time, 0, stop, right=False)
+                if end_time:
+                    stop = _bisect_timestamp(entries, end_time, start, stop, right=True)
+                entries = list(islice(entries, start, stop))
+            else:
+                entries = [
+                    e for e in entries
+                    if (not start_time or e.timestamp >= start_time)
+                    and (not end_time or e.timestamp <= end_time)
+                ]
         
         try:
             if format_type.lower() == "json":
-                with open(file_path, 'w') as f:
-                    json.dump([asdict(entry) for entry in entries], f, indent=2)
+                with open(file_path, 'wb') as f:
+                    f.write(_dumps_pretty([entry.to_dict() for entry in entries]))
             elif format_type.lower() == "csv":
                 import csv
                 with open(file_path, 'w', newline='') as f:
                     if entries:
-                        writer = csv.DictWriter(f, fieldnames=asdict(entries[0]).keys())
-                        writer.writeheader()
-                        for entry in entries:
-                            writer.writerow(asdict(entry))
+                        writer = csv.writer(f)
+                        writer.writerow(LOG_ENTRY_FIELDS)
+                        writer.writerows(
+                            (
+                                e.timestamp, e.level, e.component, e.event_type,
+                                e.task_id, e.message,
+                                _dumps_text(e.data) if e.data else None,
+                                e.execution_time, e.error
+                            )
+                            for e in entries
+                        )
             
-            self.logger.info(f"Logs exported to {file_path}")
+            self.logger.info("Logs exported to %s", file_path)
             
         except Exception as e:
-            self.logger.error(f"Failed to export logs: {e}")
+            self.logger.error("Failed to export logs: %s", e)
     
     def clear_logs(self):
         """Clear log entries from memory"""
         with self.entry_lock:
             self.log_entries.clear()
-        self.performance_metrics.clear()
+            self._entries_in_time_order = True
+            self.performance_metrics.clear()
         self.error_counts.clear()
         
         self.logger.info("Log entries cleared")
@@ -346,51 +544,211 @@ class AgentLogger:
         task_id: Optional[str] = None,
         data: Optional[Dict[str, Any]] = None,
         execution_time: Optional[float] = None,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        operation: Optional[str] = None
     ):
-        """Add structured log entry"""
+        """Add structured log entry, also recording execution_time under operation if given"""
+        # These repeat across thousands of buffered entries, so share one copy
+        # of each (callers may pass strings built at runtime, e.g. components)
         entry = LogEntry(
-            timestamp=time.time(),
-            level=level,
-            component=component,
-            event_type=event_type,
-            task_id=task_id,
-            message=message,
-            data=data,
-            execution_time=execution_time,
-            error=error
+            0.0, _intern(level), _intern(component), _intern(event_type),
+            task_id, message, data, execution_time, error
         )
         
+        # Buffer and metrics are updated together under one lock acquisition.
+        # The timestamp is read under the lock too, so concurrent producers
+        # append in time order unless the wall clock steps back.
         with self.entry_lock:
-            self.log_entries.append(entry)
+            entry.timestamp = time.time()
+            entries = self.log_entries
+            if entries and entry.timestamp < entries[-1].timestamp:
+                self._entries_in_time_order = False
+            entries.append(entry)
+            if operation is not None:
+                self._update_metrics(operation, execution_time)
+        
+        # Hand off to the writer thread if a structured file is configured.
+        # The line is serialized here, like QueueHandler.prepare(), so later
+        # changes by the caller to dicts in data cannot alter or break it.
+        if self.async_logging:
+            line = self._format_structured_entry(entry)
+            if line is not None:
+                self.log_queue.put(line)
+    
+    def _format_structured_entry(self, entry: LogEntry) -> Optional[bytes]:
+        """Serialize entry as one JSON line, or None if it cannot be encoded"""
+        try:
+            return _dumps_line(entry.to_dict())
+        except Exception as e:
+            self.logger.error("Failed to write structured log: %s", e)
+            return None
+    
+    def _write_structured_lines(self, lines: List[bytes]):
+        """Append a batch of JSON lines to the structured file"""
+        try:
+            # One write per batch; O_APPEND places it at the end of the file.
+            # This already runs off the caller's thread, so an async submission
+            # queue (io_uring) would save at most one syscall per batch.
+            blob = b"".join(lines)
+            view = memoryview(blob)
+            while view:
+                view = view[os.write(self._structured_fd, view):]
             
-            # Maintain max entries limit
-            if len(self.log_entries) > self.max_entries:
-                self.log_entries = self.log_entries[-self.max_entries:]
+            self._structured_size += len(blob)
+            if 0 < self.structured_max_bytes <= self._structured_size:
+                self._rotate_structured_file()
+        except Exception as e:
+            self.logger.error("Failed to write structured log: %s", e)
+    
+    def _open_structured_file(self):
+        """Open structured_file for appending and note its current size"""
+        self._structured_fd = os.open(
+            self.structured_file,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT
+            | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0),
+            0o644
+        )
+        self._structured_size = os.fstat(self._structured_fd).st_size
+    
+    def _rotate_structured_file(self):
+        """Move the full structured file aside and gzip it in the background"""
+        # Fixed-width stamps so archive names sort chronologically
+        while True:
+            now = time.time()
+            rotated = "%s.%s-%06d" % (self.structured_file,
+                                      time.strftime('%Y%m%d-%H%M%S', time.localtime(now)),
+                                      int(now % 1 * 1_000_000))
+            if not (os.path.exists(rotated) or os.path.exists(rotated + ".gz")):
+                break
         
-        # Write to structured file if configured
-        if self.structured_file:
-            self._write_structured_entry(entry)
+        os.close(self._structured_fd)
+        self._structured_fd = None
+        os.replace(self.structured_file, rotated)
+        self._open_structured_file()
+        
+        self._compress_threads = [t for t in self._compress_threads if t.is_alive()]
+        thread = threading.Thread(
+            target=self._compress_rotated_file,
+            args=(rotated,),
+            name=f"{self.name}-structured-compress",
+            daemon=True
+        )
+        thread.start()
+        self._compress_threads.append(thread)
     
-    def _write_structured_entry(self, entry: LogEntry):
-        """Write structured entry to file"""
+    def _compress_rotated_file(self, path: str):
+        """Gzip a rotated structured file and prune the oldest archives"""
         try:
-            with open(self.structured_file, 'a') as f:
-                json.dump(asdict(entry), f)
-                f.write('\n')
+            with open(path, 'rb') as src, gzip.open(path + ".gz.tmp", 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            os.replace(path + ".gz.tmp", path + ".gz")
+            os.unlink(path)
+            
+            if self.structured_backup_count > 0:
+                directory, base = os.path.split(os.path.abspath(self.structured_file))
+                archives = sorted(
+                    name for name in os.listdir(directory)
+                    if name.startswith(base + ".") and name.endswith(".gz")
+                )
+                for name in archives[:-self.structured_backup_count]:
+                    try:
+                        os.unlink(os.path.join(directory, name))
+                    except FileNotFoundError:
+                        # Already pruned by another compression thread
+                        pass
         except Exception as e:
-            self.logger.error(f"Failed to write structured log: {e}")
+            self.logger.error("Failed to compress rotated structured log %s: %s", path, e)
+    
+    def _drain_queue(self):
+        """Write queued lines to the structured file until close()"""
+        queue = self.log_queue
+        
+        while True:
+            batch = [queue.get()]
+            while len(batch) < STRUCTURED_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                except Empty:
+                    break
+            
+            stop = False
+            lines = []
+            # Events queued by flush(), set once everything before them is written
+            waiters = []
+            for item in batch:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif not stop:
+                    lines.append(item)
+            
+            if lines:
+                self._write_structured_lines(lines)
+            
+            for waiter in waiters:
+                waiter.set()
+            
+            if stop:
+                return
+    
+    def flush(self):
+        """Wait until queued structured entries have been written"""
+        writer = self._writer_thread
+        if writer is not None and writer.is_alive():
+            done = threading.Event()
+            self.log_queue.put(done)
+            # Stop waiting if close() ends the writer first
+            while not done.wait(0.1) and writer.is_alive():
+                pass
+    
+    def close(self):
+        """Stop the writer threads and close the log files"""
+        # Registered in __init__; dropping it lets a closed logger be collected
+        atexit.unregister(self.close)
+        # Nothing drains log_queue once the writer stops, so stop filling it
+        self.async_logging = False
+        if self._writer_thread is not None and self._writer_thread.is_alive():
+            self.log_queue.put(None)
+            self._writer_thread.join()
+        if self._structured_fd is not None:
+            os.close(self._structured_fd)
+            self._structured_fd = None
+        for thread in self._compress_threads:
+            thread.join()
+        self._compress_threads = []
+        
+        if self._log_listener is not None:
+            self.logger.removeHandler(self._queue_handler)
+            self._log_listener.stop()
+            for handler in self._log_listener.handlers:
+                handler.close()
+            self._log_listener = None
+            self._queue_handler = None
     
     def _track_performance(self, operation: str, execution_time: float):
         """Track performance metrics"""
-        if operation not in self.performance_metrics:
-            self.performance_metrics[operation] = []
-        
-        self.performance_metrics[operation].append(execution_time)
-        
-        # Keep only last 1000 measurements per operation
-        if len(self.performance_metrics[operation]) > 1000:
-            self.performance_metrics[operation] = self.performance_metrics[operation][-1000:]
+        with self.entry_lock:
+            self._update_metrics(operation, execution_time)
+    
+    def _update_metrics(self, operation: str, execution_time: float):
+        """Fold one timing into the running stats (caller holds entry_lock)"""
+        metrics = self.performance_metrics.get(operation)
+        if metrics is None:
+            self.performance_metrics[operation] = {
+                "count": 1,
+                "sum": execution_time,
+                "min": execution_time,
+                "max": execution_time
+            }
+            return
+        
+        metrics["count"] += 1
+        metrics["sum"] += execution_time
+        if execution_time < metrics["min"]:
+            metrics["min"] = execution_time
+        if execution_time > metrics["max"]:
+            metrics["max"] = execution_time
 
 
 class DebugSession:
@@ -437,7 +795,7 @@ class DebugSession:
         print(f"Files: {len(context.files)}")
         print(f"Conversation: {len(context.conversation_history)} messages")
         print(f"Error: {context.error_context is not None}")
-        print(f"Updated: {datetime.fromtimestamp(context.updated_at)}")
+        print(f"Updated: {_format_timestamp(context.updated_at)}")
     
     def print_response(self, response: AgentResponse):
         """Print response debug info"""
@@ -445,7 +803,7 @@ class DebugSession:
         print(f"Content length: {len(response.content)}")
         print(f"Has tool request: {response.has_tool_request()}")
         print(f"Confidence: {response.confidence}")
-        print(f"State: {response.state.value}")
+        print(f"State: {response.state}")
         print(f"Execution time: {response.execution_time}")
         print(f"Error: {response.error}")
     
@@ -486,8 +844,11 @@ class DebugSession:
                 elif cmd == "logs":
                     count = int(command[1]) if len(command) > 1 else 10
                     logs = self.logger.get_recent_logs(count)
-                    for log in logs:
-                        print(f"{datetime.fromtimestamp(log.timestamp)} - {log.level} - {log.message}")
+                    if logs:
+                        print("\n".join(
+                            f"{_format_timestamp(log.timestamp)} - {log.level} - {log.message}"
+                            for log in logs
+                        ))
                 else:
                     print("Unknown command")
                     
@@ -8,12 +8,36 @@ through the Ollama API with proper error handling and retry logic.
 import json
 import time
 import logging
-from typing import Dict, Any, Optional, List, Union
+from bisect import bisect_left
+from typing import Dict, Any, Optional, List, Union, Iterator
 from dataclasses import dataclass
+from functools import lru_cache, partial
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib3.util.retry import Retry
 
+from .utils import _DATACLASS_SLOTS, _JSON_HEADERS, _json_dumps, _json_loads, _load_httpx
+
+# Connect and read timeouts (seconds) for fail-fast probe requests
+PROBE_CONNECT_TIMEOUT = 2.0
+PROBE_READ_TIMEOUT = 5.0
+
+
+async def _close_when_loop_ends(client):
+    """
+    Async generator that closes ``client`` when it is finalized.
+    
+    asyncio.run() finalizes its loop's async generators before closing the
+    loop, so a client shared across asyncio.run() calls (e.g. one from
+    create_client_from_config) has its pool closed while the loop that
+    owns the connections can still run, instead of leaking it per loop.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
 
 class OllamaError(Exception):
     """Base exception for Ollama API errors"""
@@ -30,7 +54,7 @@ class APIConnectionError(OllamaError):
     pass
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ModelResponse:
     """Represents a response from the Ollama model"""
     content: str
@@ -45,7 +69,7 @@ class ModelResponse:
     eval_duration: Optional[int] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class GenerateRequest:
     """Request parameters for model generation"""
     model: str
@@ -72,7 +96,14 @@ class OllamaClient:
         model_name: str = "olympus-coder-v1",
         timeout: int = 60,
         max_retries: int = 3,
-        backoff_factor: float = 0.3
+        backoff_factor: float = 0.3,
+        parallel: int = 4,
+        batch_window_ms: float = 0.0,
+        max_batch: int = 8,
+        batch_bins: Optional[List[int]] = None,
+        pool_size: int = 32,
+        connect_timeout: float = 10.0,
+        pool_timeout: float = 5.0
     ):
         """
         Initialize Ollama client.
@@ -80,26 +111,82 @@ class OllamaClient:
         Args:
             base_url: Ollama server base URL
             model_name: Name of the deployed Olympus-Coder-v1 model
-            timeout: Request timeout in seconds
+            timeout: Read timeout in seconds (time allowed between bytes of
+                the response, which covers slow generations)
             max_retries: Maximum number of retry attempts
             backoff_factor: Backoff factor for retry delays
+            parallel: Maximum concurrent connections used by agenerate/achat.
+                The server only decodes this many requests at once if it is
+                started with OLLAMA_NUM_PARALLEL at least as large (and
+                OLLAMA_MAX_LOADED_MODELS if several models are in use).
+            batch_window_ms: If > 0, agenerate calls arriving within this many
+                milliseconds are released to the server together (see
+                RequestCoalescer)
+            max_batch: Most agenerate calls released together
+            batch_bins: Optional ascending output-length bounds (tokens) used
+                to collect coalesced requests into separate batches per
+                length bin, e.g. [128, 512, 2048, 8192]
+            pool_size: Connections kept open per host by the sync session;
+                size it to the number of threads sharing the client
+            connect_timeout: Seconds allowed to open a connection
+            pool_timeout: Seconds an async request waits for a free
+                connection when ``parallel`` requests are already in flight;
+                keep ``parallel`` at least ``max_batch`` when coalescing
         """
         self.base_url = base_url.rstrip('/')
         self.model_name = model_name
         self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.pool_timeout = pool_timeout
+        self.parallel = parallel
         self.logger = logging.getLogger(__name__)
         
+        # httpx.AsyncClient for agenerate/achat, created per event loop and
+        # closed when that loop shuts down (see _close_when_loop_ends)
+        self._aclient = None
+        self._aclient_loop = None
+        self._aclient_guard = None
+        
+        self.batch_window_ms = batch_window_ms
+        self.max_batch = max_batch
+        self.batch_bins = batch_bins
+        self._coalescer = None
+        
         # Configure session with retry strategy
         self.session = requests.Session()
         retry_strategy = Retry(
             total=max_retries,
             status_forcelist=[429, 500, 502, 503, 504],
-            method_whitelist=["HEAD", "GET", "POST"],
-            backoff_factor=backoff_factor
+            allowed_methods=frozenset(["HEAD", "GET", "POST"]),
+            backoff_factor=backoff_factor,
+            # Wait as long as a 429/503 asks instead of the backoff schedule
+            respect_retry_after_header=True,
+            # Return the last response so _make_request reports its status
+            raise_on_status=False
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry_strategy,
+            pool_block=False
+        )
+        # Advertise every encoding urllib3 can decode here (zstd and br only
+        # when their packages are installed), so a compressing proxy in
+        # front of a remote server can shrink long completions
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": ACCEPT_ENCODING
+        })
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        
+        # Probes (health_check, model_exists) should report a down server
+        # at once rather than after the whole retry schedule
+        self._probe_session = requests.Session()
+        self._probe_session.headers.update(self.session.headers)
+        probe_adapter = HTTPAdapter(max_retries=0)
+        self._probe_session.mount("http://", probe_adapter)
+        self._probe_session.mount("https://", probe_adapter)
     
     def generate(
         self,
@@ -115,7 +202,8 @@ class OllamaClient:
             prompt: User prompt/request
             system_prompt: Optional system prompt override
             options: Model parameters (temperature, top_p, etc.)
-            stream: Whether to stream the response
+            stream: Whether to stream the response; the chunks are read as
+                they arrive and joined into one ModelResponse
             
         Returns:
             ModelResponse object with generated content and metadata
@@ -125,6 +213,9 @@ class OllamaClient:
             APIConnectionError: If unable to connect to API
             OllamaError: For other API errors
         """
+        if stream:
+            return self._join_chunks(self.generate_stream(prompt, system_prompt, options))
+        
         request_data = GenerateRequest(
             model=self.model_name,
             prompt=prompt,
@@ -147,6 +238,64 @@ class OllamaClient:
             self.logger.error(f"Request failed: {e}")
             raise APIConnectionError(f"Failed to connect to Ollama API: {e}")
     
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Iterator[ModelResponse]:
+        """
+        Stream a response from Olympus-Coder-v1 model as it is generated.
+        
+        Each yielded ModelResponse holds only the text of that chunk; the
+        final one has done=True and carries the timing and token counts.
+        Closing the iterator early closes the HTTP stream, which stops the
+        generation on the server.
+        
+        Args:
+            prompt: User prompt/request
+            system_prompt: Optional system prompt override
+            options: Model parameters (temperature, top_p, etc.)
+            
+        Yields:
+            Partial ModelResponse objects in arrival order
+        """
+        request_data = GenerateRequest(
+            model=self.model_name,
+            prompt=prompt,
+            system=system_prompt,
+            stream=True,
+            options=options or {}
+        )
+        
+        try:
+            self.logger.debug(f"Sending streaming generate request to {self.model_name}")
+            response = self._make_request(
+                "POST",
+                "/api/generate",
+                json=self._serialize_request(request_data),
+                stream=True
+            )
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Request failed: {e}")
+            raise APIConnectionError(f"Failed to connect to Ollama API: {e}")
+        
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                try:
+                    data = _json_loads(line)
+                except ValueError as e:
+                    raise OllamaError(f"Failed to parse response: {e}")
+                if "error" in data:
+                    raise OllamaError(f"Generation failed: {data['error']}")
+                yield self._response_from_data(data)
+        except requests.exceptions.RequestException as e:
+            raise APIConnectionError(f"Connection lost while streaming: {e}")
+        finally:
+            response.close()
+    
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -180,6 +329,90 @@ class OllamaClient:
             self.logger.error(f"Chat request failed: {e}")
             raise APIConnectionError(f"Failed to connect to Ollama API: {e}")
     
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> ModelResponse:
+        """
+        Async variant of generate, for running many requests concurrently.
+        
+        Uses a pooled httpx.AsyncClient when httpx is installed, otherwise
+        runs generate in the default thread pool.
+        
+        Raises:
+            ModelNotFoundError: If model is not found
+            APIConnectionError: If unable to connect to API
+            OllamaError: For other API errors
+        """
+        if self.batch_window_ms > 0:
+            return await self._get_coalescer().submit(prompt, system_prompt, options)
+        return await self._agenerate_now(prompt, system_prompt, options)
+    
+    async def _agenerate_now(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> ModelResponse:
+        """Send one async generate request immediately"""
+        if _load_httpx() is None:
+            return await self._run_sync(self.generate, prompt, system_prompt, options)
+        
+        request_data = GenerateRequest(
+            model=self.model_name,
+            prompt=prompt,
+            system=system_prompt,
+            options=options or {}
+        )
+        
+        self.logger.debug("Sending async generate request to %s", self.model_name)
+        response = await self._amake_request(
+            "POST",
+            "/api/generate",
+            json=self._serialize_request(request_data)
+        )
+        return self._parse_response(response)
+    
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> ModelResponse:
+        """
+        Async variant of chat, for running many conversations concurrently.
+        
+        Uses a pooled httpx.AsyncClient when httpx is installed, otherwise
+        runs chat in the default thread pool.
+        """
+        if _load_httpx() is None:
+            return await self._run_sync(self.chat, messages, options)
+        
+        request_data = {
+            "model": self.model_name,
+            "messages": messages,
+            "stream": False,
+            "options": options or {}
+        }
+        
+        self.logger.debug("Sending async chat request to %s", self.model_name)
+        response = await self._amake_request("POST", "/api/chat", json=request_data)
+        return self._parse_response(response)
+    
+    async def aclose(self):
+        """Stop the request coalescer and close the async connection pool"""
+        if self._coalescer is not None:
+            await self._coalescer.aclose()
+            self._coalescer = None
+        if self._aclient_guard is not None:
+            import asyncio
+            guard, loop = self._aclient_guard, self._aclient_loop
+            self._aclient = self._aclient_loop = self._aclient_guard = None
+            # A client from another loop is closed when that loop shuts down
+            if loop is asyncio.get_running_loop():
+                await guard.aclose()
+    
     def list_models(self) -> List[Dict[str, Any]]:
         """
         List available models on the Ollama server.
@@ -207,7 +440,8 @@ class OllamaClient:
         """
         check_model = model_name or self.model_name
         try:
-            models = self.list_models()
+            response = self._make_request("GET", "/api/tags", fail_fast=True)
+            models = response.json().get("models", [])
             return any(model.get("name") == check_model for model in models)
         except APIConnectionError:
             return False
@@ -238,9 +472,66 @@ class OllamaClient:
         """
         Perform health check on Ollama server and model.
         
+        The server and the model are probed concurrently; a 404 from
+        /api/show means the model is not available.
+        
         Returns:
             Health status dictionary with server and model status
         """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        start_time = time.time()
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            info_future = pool.submit(
+                self._make_request, "POST", "/api/show",
+                json={"name": self.model_name}, fail_fast=True
+            )
+            
+            # Check server accessibility
+            try:
+                tags_result = self._make_request("GET", "/api/tags", fail_fast=True)
+            except Exception as e:
+                tags_result = e
+            
+            # Check model availability
+            try:
+                info_result = info_future.result().json()
+            except Exception as e:
+                info_result = e
+        
+        return self._health_status(tags_result, info_result, start_time)
+    
+    async def ahealth_check(self) -> Dict[str, Any]:
+        """
+        Async variant of health_check.
+        
+        Uses httpx when installed, otherwise runs health_check in the default
+        thread pool.
+        """
+        if _load_httpx() is None:
+            return await self._run_sync(self.health_check)
+        
+        import asyncio
+        start_time = time.time()
+        
+        # httpx does not retry, so only the timeouts need shortening
+        tags_result, info_result = await asyncio.gather(
+            self._amake_request("GET", "/api/tags", timeout=PROBE_READ_TIMEOUT),
+            self._amake_request("POST", "/api/show", timeout=PROBE_READ_TIMEOUT,
+                                json={"name": self.model_name}),
+            return_exceptions=True
+        )
+        if not isinstance(info_result, BaseException):
+            try:
+                info_result = _json_loads(info_result.content)
+            except ValueError as e:
+                info_result = OllamaError(f"Failed to parse response: {e}")
+        
+        return self._health_status(tags_result, info_result, start_time)
+    
+    def _health_status(self, tags_result, info_result, start_time: float) -> Dict[str, Any]:
+        """Build the health_check dictionary from the two probe outcomes."""
         health_status = {
             "server_accessible": False,
             "model_available": False,
@@ -249,24 +540,17 @@ class OllamaClient:
             "error": None
         }
         
-        start_time = time.time()
-        
-        try:
-            # Check server accessibility
-            response = self._make_request("GET", "/api/tags", timeout=10)
+        if isinstance(tags_result, BaseException):
+            health_status["error"] = str(tags_result)
+        else:
             health_status["server_accessible"] = True
-            
-            # Check model availability
-            if self.model_exists():
+            if not isinstance(info_result, BaseException):
                 health_status["model_available"] = True
-                health_status["model_info"] = self.show_model_info()
-            
-            health_status["response_time"] = time.time() - start_time
-            
-        except Exception as e:
-            health_status["error"] = str(e)
-            health_status["response_time"] = time.time() - start_time
+                health_status["model_info"] = info_result
+            elif not isinstance(info_result, ModelNotFoundError):
+                health_status["error"] = str(info_result)
         
+        health_status["response_time"] = time.time() - start_time
         return health_status
     
     def _make_request(
@@ -274,17 +558,33 @@ class OllamaClient:
         method: str,
         endpoint: str,
         timeout: Optional[int] = None,
+        fail_fast: bool = False,
         **kwargs
     ) -> requests.Response:
-        """Make HTTP request to Ollama API with error handling."""
+        """
+        Make HTTP request to Ollama API with error handling.
+        
+        With fail_fast the request is sent once, without retries, and with
+        the short probe timeouts.
+        """
         url = f"{self.base_url}{endpoint}"
-        request_timeout = timeout or self.timeout
+        if fail_fast:
+            session = self._probe_session
+            request_timeout = timeout or PROBE_READ_TIMEOUT
+            connect_timeout = min(self.connect_timeout, PROBE_CONNECT_TIMEOUT)
+        else:
+            session = self.session
+            request_timeout = timeout or self.timeout
+            connect_timeout = self.connect_timeout
+        if "json" in kwargs:
+            kwargs["data"] = _json_dumps(kwargs.pop("json"))
+            kwargs["headers"] = _JSON_HEADERS
         
         try:
-            response = self.session.request(
+            response = session.request(
                 method,
                 url,
-                timeout=request_timeout,
+                timeout=(min(connect_timeout, request_timeout), request_timeout),
                 **kwargs
             )
             response.raise_for_status()
@@ -301,8 +601,95 @@ class OllamaClient:
         except requests.exceptions.ConnectionError as e:
             raise APIConnectionError(f"Connection error: {e}")
     
+    async def _run_sync(self, func, *args):
+        """Run a blocking client method in the default thread pool"""
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+    
+    async def _get_aclient(self):
+        """Return the httpx.AsyncClient for the running event loop"""
+        import asyncio
+        httpx = _load_httpx()
+        loop = asyncio.get_running_loop()
+        # Pooled connections belong to the loop that opened them
+        if self._aclient is None or self._aclient_loop is not loop:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.parallel,
+                    max_keepalive_connections=self.parallel
+                )
+            )
+            guard = _close_when_loop_ends(client)
+            # Starting the generator registers it with this loop
+            await guard.__anext__()
+            self._aclient, self._aclient_loop, self._aclient_guard = client, loop, guard
+        return self._aclient
+    
+    def _get_coalescer(self) -> "RequestCoalescer":
+        """Return the RequestCoalescer for the running event loop"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if self._coalescer is None or self._coalescer.loop is not loop:
+            self._coalescer = RequestCoalescer(
+                self._agenerate_now,
+                batch_window_ms=self.batch_window_ms,
+                max_batch=self.max_batch,
+                bins=self.batch_bins
+            )
+        return self._coalescer
+    
+    async def _amake_request(
+        self,
+        method: str,
+        endpoint: str,
+        timeout: Optional[int] = None,
+        **kwargs
+    ):
+        """Async counterpart of _make_request using httpx."""
+        httpx = _load_httpx()
+        request_timeout = timeout or self.timeout
+        if "json" in kwargs:
+            kwargs["content"] = _json_dumps(kwargs.pop("json"))
+            kwargs["headers"] = _JSON_HEADERS
+        
+        try:
+            client = await self._get_aclient()
+            response = await client.request(
+                method,
+                endpoint,
+                # Waiting for a pooled connection is bounded separately, so a
+                # full pool fails fast instead of after a whole read timeout
+                timeout=httpx.Timeout(request_timeout,
+                                      connect=min(self.connect_timeout, request_timeout),
+                                      pool=min(self.pool_timeout, request_timeout)),
+                **kwargs
+            )
+            response.raise_for_status()
+            return response
+        
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise ModelNotFoundError(f"Model '{self.model_name}' not found")
+            raise OllamaError(f"HTTP error {e.response.status_code}: {e}")
+        
+        except httpx.PoolTimeout:
+            raise OllamaError(
+                f"No free connection after {min(self.pool_timeout, request_timeout)} seconds: "
+                f"all {self.parallel} async connections are busy (raise parallel)"
+            )
+        
+        except httpx.TimeoutException:
+            raise OllamaError(f"Request timeout after {request_timeout} seconds")
+        
+        except httpx.TransportError as e:
+            raise APIConnectionError(f"Connection error: {e}")
+    
     def _serialize_request(self, request: GenerateRequest) -> Dict[str, Any]:
         """Serialize GenerateRequest to dictionary."""
+        # Written out field by field on purpose: this is as fast as a
+        # generated serializer, and dataclasses.asdict is ~60x slower
         data = {
             "model": request.model,
             "prompt": request.prompt,
@@ -327,29 +714,203 @@ class OllamaClient:
     def _parse_response(self, response: requests.Response) -> ModelResponse:
         """Parse Ollama API response into ModelResponse object."""
         try:
-            data = response.json()
-            
-            return ModelResponse(
-                content=data.get("response", ""),
-                model=data.get("model", self.model_name),
-                created_at=data.get("created_at", ""),
-                done=data.get("done", True),
-                total_duration=data.get("total_duration"),
-                load_duration=data.get("load_duration"),
-                prompt_eval_count=data.get("prompt_eval_count"),
-                prompt_eval_duration=data.get("prompt_eval_duration"),
-                eval_count=data.get("eval_count"),
-                eval_duration=data.get("eval_duration")
-            )
+            return self._response_from_data(_json_loads(response.content))
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (ValueError, KeyError) as e:
             raise OllamaError(f"Failed to parse response: {e}")
+    
+    def _response_from_data(self, data: Dict[str, Any]) -> ModelResponse:
+        """Build a ModelResponse from one decoded response object."""
+        return ModelResponse(
+            content=data.get("response", ""),
+            model=data.get("model", self.model_name),
+            created_at=data.get("created_at", ""),
+            done=data.get("done", True),
+            total_duration=data.get("total_duration"),
+            load_duration=data.get("load_duration"),
+            prompt_eval_count=data.get("prompt_eval_count"),
+            prompt_eval_duration=data.get("prompt_eval_duration"),
+            eval_count=data.get("eval_count"),
+            eval_duration=data.get("eval_duration")
+        )
+    
+    def _join_chunks(self, chunks: Iterator[ModelResponse]) -> ModelResponse:
+        """Concatenate streamed chunks into a single ModelResponse."""
+        parts = []
+        last = None
+        for chunk in chunks:
+            parts.append(chunk.content)
+            last = chunk
+        
+        if last is None:
+            raise OllamaError("Failed to parse response: empty stream")
+        last.content = "".join(parts)
+        return last
+
+
+def _resolve_future(future, task):
+    """Pass a finished generate task's outcome on to the caller's future"""
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+
+class RequestCoalescer:
+    """
+    Groups async generate calls that arrive close together.
+    
+    Ollama has no multi-prompt endpoint, but concurrent requests are batched
+    inside its runner. Holding requests for a few milliseconds and then
+    sending them together lets a burst of callers land in the same decode
+    batch instead of trickling in one at a time. Batches are not awaited
+    before the next window opens, so up to the connection limit stay in
+    flight.
+    
+    With ``bins`` set, requests are collected per expected-output-length bin:
+    each bin has its own window and ``max_batch`` cap, so a burst of short
+    requests fills and releases its own batch instead of sharing slots (and
+    a window) with long generations that would decode alongside it.
+    """
+    
+    def __init__(
+        self,
+        generate,
+        batch_window_ms: float = 5.0,
+        max_batch: int = 8,
+        bins: Optional[List[int]] = None
+    ):
+        """
+        Initialize the coalescer on the running event loop.
+        
+        Args:
+            generate: Coroutine function (prompt, system_prompt, options) -> ModelResponse
+            batch_window_ms: How long to wait for more requests after the first
+            max_batch: Most requests released together
+            bins: Ascending output-length bounds in tokens; requests are binned
+                by options["num_predict"], or len(prompt) // 4 without it
+        """
+        import asyncio
+        self.generate = generate
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.bins = sorted(bins) if bins else None
+        self.loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._runner = None
+        self._in_flight = set()
+    
+    async def submit(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> ModelResponse:
+        """Queue a generate call and wait for its response"""
+        future = self.loop.create_future()
+        self._queue.put_nowait((future, prompt, system_prompt, options))
+        if self._runner is None or self._runner.done():
+            self._runner = self.loop.create_task(self._run())
+        return await future
+    
+    async def aclose(self):
+        """Stop collecting batches, send what is queued and wait for it"""
+        import asyncio
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            self._start(pending)
+        
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+    
+    async def _run(self):
+        """Collect requests into per-bin batches and dispatch each batch"""
+        import asyncio
+        queue = self._queue
+        # Bin index -> (deadline, batch); each bin opens its own window
+        pending: Dict[int, tuple] = {}
+        try:
+            while True:
+                if pending:
+                    deadline = min(deadline for deadline, _ in pending.values())
+                    remaining = deadline - self.loop.time()
+                    try:
+                        item = await asyncio.wait_for(queue.get(), max(remaining, 0))
+                    except asyncio.TimeoutError:
+                        item = None
+                else:
+                    item = await queue.get()
+                
+                if item is not None:
+                    index = self._bin_index(item)
+                    if index not in pending:
+                        pending[index] = (self.loop.time() + self.batch_window, [])
+                    batch = pending[index][1]
+                    batch.append(item)
+                    if len(batch) >= self.max_batch:
+                        del pending[index]
+                        self._start(batch)
+                
+                now = self.loop.time()
+                for index in [i for i, (deadline, _) in pending.items() if deadline <= now]:
+                    self._start(pending.pop(index)[1])
+        finally:
+            # Requests already taken off the queue still get sent on cancel
+            for _, batch in pending.values():
+                self._start(batch)
+    
+    def _start(self, batch: List[tuple]):
+        """Dispatch a batch without waiting for it"""
+        task = self.loop.create_task(self._dispatch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+    
+    def _bin_index(self, item: tuple) -> int:
+        """Length bin for a queued (future, prompt, system_prompt, options) item"""
+        if self.bins is None:
+            return 0
+        _, prompt, _, options = item
+        predicted = (options or {}).get("num_predict")
+        if not predicted or predicted < 0:
+            # Rough token estimate when the caller did not cap the output
+            predicted = len(prompt) // 4
+        return bisect_left(self.bins, predicted)
+    
+    async def _dispatch(self, batch: List[tuple]):
+        """Send a batch concurrently, resolving each future as its request finishes"""
+        import asyncio
+        tasks = []
+        for future, prompt, system_prompt, options in batch:
+            task = self.loop.create_task(self.generate(prompt, system_prompt, options))
+            task.add_done_callback(partial(_resolve_future, future))
+            tasks.append(task)
+        # Only waits for the batch to drain; callers are already answered
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def create_client_from_config(config_path: str = None) -> OllamaClient:
     """
     Create OllamaClient instance from configuration file.
     
+    Calls with the same effective configuration return the same client, so
+    its connection pool is reused. The client is shared: requests.Session
+    is safe to use from several threads for ordinary requests. Its async
+    connection pool is per event loop and closed when that loop shuts down.
+    
     Args:
         config_path: Path to configuration file (optional)
         
@@ -374,4 +935,14 @@ def create_client_from_config(config_path: str = None) -> OllamaClient:
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logging.warning(f"Could not load config from {config_path}: {e}")
     
-    return OllamaClient(**config)
\ No newline at end of file
+    # Lists (e.g. batch_bins) become tuples so the config can be a cache key
+    return _client_for(tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in config.items()
+    )))
+
+
+@lru_cache(maxsize=8)
+def _client_for(config_items: tuple) -> OllamaClient:
+    """Build and cache one OllamaClient per frozen configuration"""
+    return OllamaClient(**dict(config_items))
\ No newline at end of file
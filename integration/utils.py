@@ -7,13 +7,101 @@ and common integration tasks.
 
 import json
 import logging
+import os
 import re
-from typing import Dict, Any, Optional, List, Union, Tuple
+import sys
+from typing import Dict, Any, Optional, List, Union, Tuple, Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+# Optional speedups shared by the package modules; each falls back to the
+# standard library when the dependency is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    _json_loads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Optional; imported on first use by _load_httpx()
+httpx = None
+
+
+def _load_httpx():
+    """Import httpx for the async API; returns None when it is not installed"""
+    global httpx
+    if httpx is None:
+        try:
+            import httpx as _httpx
+        except ImportError:
+            return None
+        httpx = _httpx
+    return httpx
+
+
+# File extension to code fence language, used by _detect_language
+_EXTENSION_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "jsx",
+    ".tsx": "tsx",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".php": "php",
+    ".rb": "ruby",
+    ".go": "go",
+    ".rs": "rust",
+    ".sh": "bash",
+    ".sql": "sql",
+    ".html": "html",
+    ".css": "css",
+    ".json": "json",
+    ".xml": "xml",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".md": "markdown",
+    ".txt": "text"
+}
+
+# Parameters each known tool must be given, checked by validate_tool_request
+_TOOL_REQUIRED_PARAMS = {
+    "read_file": ("file_path",),
+    "write_file": ("file_path", "content"),
+    "execute_command": ("command",),
+    "list_directory": ("path",),
+    "search_files": ("query",),
+}
+
+# Characters that matter when matching braces: braces, quotes, escapes and
+# newlines (which cannot occur inside a JSON string)
+_JSON_TOKEN_RE = re.compile(r'[{}"\n]|\\.', re.DOTALL)
+
+# How a JSON object starts: '{' then a key or the closing brace
+_JSON_OBJECT_START_RE = re.compile(r'\{\s*["}]')
+
+# Fenced code blocks for extract_code_blocks
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\s*\n(.*?)\n```', re.DOTALL)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ToolRequest:
     """Represents a parsed tool request from model response"""
     tool_name: str
@@ -44,28 +132,28 @@ def setup_logging(
             "%(filename)s:%(lineno)d - %(message)s"
         )
     
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format=format_string,
-        handlers=[]
-    )
+    level_value = getattr(logging, level.upper())
+    formatter = logging.Formatter(format_string)
     
     # Add console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(format_string))
+    console_handler.setFormatter(formatter)
     
     # Add file handler if specified
     handlers = [console_handler]
     if log_file:
         file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(logging.Formatter(format_string))
+        file_handler.setFormatter(formatter)
         handlers.append(file_handler)
     
-    # Get logger for integration module
+    # Get logger for integration module; the root logger is left untouched
+    # and records are not passed up to it, so nothing is logged twice
     logger = logging.getLogger("olympus_coder_integration")
+    for handler in logger.handlers:
+        handler.close()
     logger.handlers = handlers
-    logger.setLevel(getattr(logging, level.upper()))
+    logger.setLevel(level_value)
+    logger.propagate = False
     
     return logger
 
@@ -90,52 +178,43 @@ def format_context(
     Returns:
         Formatted context string
     """
-    context_parts = []
-    
-    # Add current task
-    if current_task:
-        context_parts.append(f"## Current Task\n{current_task}\n")
-    
-    # Add project structure
-    if project_structure:
-        context_parts.append("## Project Structure")
-        context_parts.append(_format_project_structure(project_structure))
-        context_parts.append("")
-    
-    # Add file contents
-    if files:
-        context_parts.append("## Relevant Files")
-        for file_info in files:
-            path = file_info.get("path", "unknown")
-            content = file_info.get("content", "")
-            language = _detect_language(path)
-            
-            context_parts.append(f"### {path}")
-            context_parts.append(f"```{language}")
-            context_parts.append(content)
-            context_parts.append("```")
-            context_parts.append("")
-    
-    # Add error context
-    if error_context:
-        context_parts.append("## Error Context")
-        context_parts.append("```")
-        context_parts.append(error_context)
-        context_parts.append("```")
-        context_parts.append("")
-    
-    # Add conversation history (last few messages)
-    if conversation_history:
-        context_parts.append("## Recent Context")
-        # Include last 3 messages to maintain context
-        recent_messages = conversation_history[-3:] if len(conversation_history) > 3 else conversation_history
-        for msg in recent_messages:
-            role = msg.get("role", "unknown")
-            content = msg.get("content", "")
-            context_parts.append(f"**{role.title()}:** {content[:200]}...")
-        context_parts.append("")
-    
-    return "\n".join(context_parts)
+    def _iter_parts():
+        # Add current task
+        if current_task:
+            yield f"## Current Task\n{current_task}\n"
+        
+        # Add project structure
+        if project_structure:
+            yield "## Project Structure"
+            yield _format_project_structure(project_structure)
+            yield ""
+        
+        # Add file contents
+        if files:
+            yield "## Relevant Files"
+            for file_info in files:
+                path = file_info.get("path", "unknown")
+                fence_open = f"```{_detect_language(path)}\n"
+                yield f"### {path}"
+                yield fence_open + file_info.get("content", "") + "\n```"
+                yield ""
+        
+        # Add error context
+        if error_context:
+            yield "## Error Context"
+            yield "```\n" + error_context + "\n```"
+            yield ""
+        
+        # Add conversation history (last 3 messages to maintain context)
+        if conversation_history:
+            yield "## Recent Context"
+            yield "\n".join(
+                f"**{(msg.get('role') or 'unknown').title()}:** {(msg.get('content') or '')[:200]}..."
+                for msg in conversation_history[-3:]
+            )
+            yield ""
+    
+    return "\n".join(_iter_parts())
 
 
 def parse_tool_response(response_text: str) -> Tuple[Optional[ToolRequest], str]:
@@ -148,43 +227,112 @@ def parse_tool_response(response_text: str) -> Tuple[Optional[ToolRequest], str]
     Returns:
         Tuple of (ToolRequest object or None, remaining text content)
     """
-    # Look for JSON tool request patterns
-    json_patterns = [
-        r'```json\s*(\{[^`]+\})\s*```',  # JSON in code blocks
-        r'(\{[^{}]*"tool_name"[^{}]*\})',  # Direct JSON objects
-        r'Tool:\s*(\{[^{}]+\})',  # Tool: prefix
-    ]
-    
-    tool_request = None
-    cleaned_text = response_text
-    
-    for pattern in json_patterns:
-        matches = re.finditer(pattern, response_text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
-            try:
-                json_str = match.group(1)
-                tool_data = json.loads(json_str)
-                
-                # Validate tool request structure
-                if "tool_name" in tool_data and "parameters" in tool_data:
-                    tool_request = ToolRequest(
-                        tool_name=tool_data["tool_name"],
-                        parameters=tool_data["parameters"],
-                        confidence=tool_data.get("confidence", 1.0),
-                        raw_response=json_str
-                    )
-                    
-                    # Remove the tool request from text
-                    cleaned_text = response_text.replace(match.group(0), "").strip()
-                    break
-                    
-            except (json.JSONDecodeError, KeyError):
-                continue
+    # Every tool request has a "tool_name" key; most responses have none
+    if '"tool_name"' not in response_text:
+        return None, response_text
+    
+    for start, end, tool_data in _iter_json_objects(response_text):
+        # Validate tool request structure
+        if "tool_name" not in tool_data or "parameters" not in tool_data:
+            continue
+        
+        tool_request = ToolRequest(
+            tool_name=tool_data["tool_name"],
+            parameters=tool_data["parameters"],
+            confidence=tool_data.get("confidence", 1.0),
+            raw_response=response_text[start:end]
+        )
+        
+        # Remove the tool request, with its ```json fence or Tool: prefix
+        before = response_text[:start].rstrip()
+        after = response_text[end:].lstrip()
+        if before[-7:].lower() == "```json" and after.startswith("```"):
+            start = len(before) - 7
+            end = len(response_text) - len(after) + 3
+        elif before[-5:].lower() == "tool:":
+            start = len(before) - 5
         
-        if tool_request:
-            break
+        cleaned_text = (response_text[:start] + response_text[end:]).strip()
+        return tool_request, cleaned_text
+    
+    return None, response_text
+
+
+def _iter_json_objects(text: str) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Find the JSON objects embedded in free text.
     
-    return tool_request, cleaned_text
+    Yields (start, end, object) for each balanced-brace span that parses as
+    a JSON object, leftmost first; spans inside a yielded object are skipped,
+    while those inside one that does not parse are still tried. Nested
+    objects are handled, unlike a regular expression.
+    """
+    consumed = 0
+    # (end, error position) of enclosing spans that did not parse
+    failed = []
+    for start, end in _brace_spans(text):
+        if start < consumed:
+            continue
+        while failed and failed[-1][0] <= start:
+            failed.pop()
+        error_pos = failed[-1][1] if failed else None
+        if error_pos is not None and start < error_pos < end:
+            # The enclosing parse was inside this object when it failed, and
+            # parsing it on its own would fail at the same place
+            failed.append((end, error_pos))
+            continue
+        if not _JSON_OBJECT_START_RE.match(text, start):
+            continue
+        try:
+            obj = _json_loads(text[start:end])
+        except ValueError as e:
+            pos = getattr(e, 'pos', None)
+            failed.append((end, None if pos is None else start + pos))
+            continue
+        except RecursionError:
+            failed.append((end, None))
+            continue
+        yield start, end, obj
+        consumed = end
+
+
+def _brace_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (start, end) of every balanced {...} span, ordered by start.
+    
+    One pass with a stack of open braces, starting at the first place a
+    JSON object could begin. Braces inside string literals are ignored;
+    quotes only count once a brace is open, and a newline ends a string, so
+    a stray quote in prose cannot affect the lines after it. Spans are
+    yielded as soon as their outermost brace closes, so a caller that stops
+    at the first match does not scan the rest of the text.
+    """
+    first = _JSON_OBJECT_START_RE.search(text)
+    if first is None:
+        return
+    spans = []
+    stack = []
+    in_string = False
+    for match in _JSON_TOKEN_RE.finditer(text, first.start()):
+        token = match.group()
+        if token == '\n':
+            in_string = False
+        elif in_string:
+            if token == '"':
+                in_string = False
+        elif token == '"':
+            in_string = bool(stack)
+        elif token == '{':
+            stack.append(match.start())
+        elif token == '}' and stack:
+            spans.append((stack.pop(), match.end()))
+            if not stack:
+                spans.sort()
+                yield from spans
+                spans = []
+    # Spans inside a brace that never closes
+    spans.sort()
+    yield from spans
 
 
 def validate_tool_request(tool_request: ToolRequest) -> Tuple[bool, List[str]]:
@@ -214,19 +362,12 @@ def validate_tool_request(tool_request: ToolRequest) -> Tuple[bool, List[str]]:
         errors.append("Confidence must be between 0.0 and 1.0")
     
     # Tool-specific validation
-    tool_validations = {
-        "read_file": ["file_path"],
-        "write_file": ["file_path", "content"],
-        "execute_command": ["command"],
-        "list_directory": ["path"],
-        "search_files": ["query"],
-    }
-    
-    if tool_request.tool_name in tool_validations:
-        required_params = tool_validations[tool_request.tool_name]
-        for param in required_params:
-            if param not in tool_request.parameters:
-                errors.append(f"Missing required parameter: {param}")
+    parameters = tool_request.parameters
+    errors.extend(
+        f"Missing required parameter: {param}"
+        for param in _TOOL_REQUIRED_PARAMS.get(tool_request.tool_name, ())
+        if param not in parameters
+    )
     
     return len(errors) == 0, errors
 
@@ -287,11 +428,7 @@ def extract_code_blocks(text: str) -> List[Dict[str, str]]:
     """
     code_blocks = []
     
-    # Pattern for fenced code blocks
-    pattern = r'```(\w+)?\s*\n(.*?)\n```'
-    matches = re.finditer(pattern, text, re.DOTALL)
-    
-    for match in matches:
+    for match in _CODE_BLOCK_RE.finditer(text):
         language = match.group(1) or "text"
         code = match.group(2).strip()
         
@@ -303,76 +440,77 @@ def extract_code_blocks(text: str) -> List[Dict[str, str]]:
     return code_blocks
 
 
-def sanitize_file_path(file_path: str) -> str:
+def sanitize_file_path(file_path: str, strict: bool = False) -> str:
     """
     Sanitize file path to prevent directory traversal attacks.
     
+    The check is lexical: ``..`` components are collapsed and paths that
+    still leave the current directory are reduced to their file name,
+    without touching the filesystem. Symlinks are not followed, so a link
+    inside the current directory that points outside it passes; callers
+    that go on to open or write the path should pass ``strict=True``.
+    
     Args:
         file_path: Input file path
+        strict: Resolve symlinks on disk before checking the path
         
     Returns:
         Sanitized file path
     """
-    # Remove any path traversal attempts
-    path = Path(file_path)
-    
-    # Resolve to absolute path and check if it's within allowed directory
-    try:
-        resolved = path.resolve()
-        # Convert back to relative path if possible
-        return str(resolved.relative_to(Path.cwd()))
-    except ValueError:
-        # If path is outside current directory, return just the filename
-        return path.name
+    if strict:
+        path = Path(file_path)
+        # Resolve to absolute path and check if it's within allowed directory
+        try:
+            resolved = path.resolve()
+            # Convert back to relative path if possible
+            return str(resolved.relative_to(Path.cwd()))
+        except ValueError:
+            # If path is outside current directory, return just the filename
+            return path.name
+    
+    path = os.path.normpath(file_path)
+    if os.path.isabs(path):
+        try:
+            path = os.path.relpath(path, os.getcwd())
+        except ValueError:
+            # Different drive on Windows
+            return os.path.basename(path)
+    
+    if path == os.pardir or path.startswith(os.pardir + os.sep):
+        # Outside the current directory, return just the filename
+        return os.path.basename(path)
+    return path
 
 
 def _format_project_structure(structure: Dict[str, Any], indent: int = 0) -> str:
     """Format project structure dictionary as tree view."""
     lines = []
-    prefix = "  " * indent
-    
-    for key, value in structure.items():
-        if isinstance(value, dict):
-            lines.append(f"{prefix}{key}/")
-            lines.append(_format_project_structure(value, indent + 1))
+    # Iterators of the directories being walked, innermost last
+    stack = [(iter(structure.items()), indent)]
+    
+    while stack:
+        items, depth = stack[-1]
+        for key, value in items:
+            if isinstance(value, dict):
+                lines.append(f"{'  ' * depth}{key}/")
+                stack.append((iter(value.items()), depth + 1))
+                break
+            lines.append(f"{'  ' * depth}{key}")
         else:
-            lines.append(f"{prefix}{key}")
+            stack.pop()
     
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=1024)
 def _detect_language(file_path: str) -> str:
     """Detect programming language from file extension."""
-    extension_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".jsx": "jsx",
-        ".tsx": "tsx",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".c": "c",
-        ".h": "c",
-        ".hpp": "cpp",
-        ".cs": "csharp",
-        ".php": "php",
-        ".rb": "ruby",
-        ".go": "go",
-        ".rs": "rust",
-        ".sh": "bash",
-        ".sql": "sql",
-        ".html": "html",
-        ".css": "css",
-        ".json": "json",
-        ".xml": "xml",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".md": "markdown",
-        ".txt": "text"
-    }
-    
-    path = Path(file_path)
-    return extension_map.get(path.suffix.lower(), "text")
+    # Same suffix rules as Path(file_path).suffix, without building a Path
+    name = file_path[file_path.rfind('/') + 1:]
+    dot = name.rfind('.')
+    if dot <= 0 or dot == len(name) - 1:
+        return "text"
+    return _EXTENSION_MAP.get(name[dot:].lower(), "text")
 
 
 def calculate_response_metrics(
@@ -4,255 +4,264 @@ PowerPoint Generator for Olympus-Coder Team Demo
 Creates a professional PowerPoint presentation from the markdown content
 """
 
-try:
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.enum.text import PP_ALIGN
-    from pptx.dml.color import RGBColor
-    from pptx.enum.shapes import MSO_SHAPE
-except ImportError:
+import importlib.util
+import os
+
+# Only shell out to pip when python-pptx is really missing, rather than on
+# any ImportError raised while importing it
+if importlib.util.find_spec("pptx") is None:
     print("Installing required packages...")
     import subprocess
     import sys
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "python-pptx"])
-    from pptx import Presentation
-    from pptx.util import Inches, Pt
-    from pptx.enum.text import PP_ALIGN
-    from pptx.dml.color import RGBColor
-    from pptx.enum.shapes import MSO_SHAPE
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "--quiet", "--no-input",
+                           "--disable-pip-version-check", "python-pptx"])
+
+# python-pptx builds its element tree on lxml (a required dependency), so
+# there is no slower ElementTree path to switch away from
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml.ns import qn
+from lxml import etree
+
+# python-pptx's default template with only the two layouts used here, so
+# opening it skips parsing the other nine (regenerate with
+# prs.slide_layouts.remove() on a fresh Presentation() if layouts change)
+_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_template.pptx")
+
+# Presentation content, built once at import time
+
+_DARK_BLUE = RGBColor(13, 27, 42)
+_LIGHT_BLUE = RGBColor(27, 38, 59)
+_ACCENT_BLUE = RGBColor(65, 105, 225)
+_WHITE = RGBColor(255, 255, 255)
+_GREEN = RGBColor(46, 125, 50)
+
+# Bullet styles keyed by line prefix; the first matching prefix wins
+_COURIER = {"font_name": "Courier New"}
+_STEP_STYLERS = (
+    ("#", {"color": _GREEN, "bold": True}),
+    ("ollama", _COURIER),
+    ("curl", _COURIER),
+)
+_TAKEAWAY_STYLERS = (
+    ("ollama", _COURIER),
+    ("GitHub:", {"color": _ACCENT_BLUE}),
+    ("Ollama:", {"color": _ACCENT_BLUE}),
+)
+
+def _prefix_style(stylers):
+    """Return a bullet style function looking up (prefix, props) pairs"""
+    def style(text):
+        for prefix, props in stylers:
+            if text.startswith(prefix):
+                return props
+        return None
+    return style
+
+def _roi_style(point):
+    if point.startswith(("📈", "🏢")):
+        return {"level": 0}
+    if "160,000%" in point:
+        return {"color": _GREEN, "bold": True}
+    return None
+
+# Content slides: title, first line, bullets (with optional per-bullet
+# style) and callout paragraphs below the bullets
+_SLIDES = (
+    {
+        # Slide 2: The Problem
+        "title": "Development Challenges We Face Daily",
+        "intro": "Current Pain Points:",
+        "bullets": (
+            "⏰ Time-consuming repetitive coding tasks",
+            "🐛 Complex debugging processes taking hours", 
+            "📚 Learning new algorithms and patterns",
+            "🔄 Writing comprehensive test cases",
+            "📝 Creating documentation and comments",
+            "💸 High development costs and tight deadlines"
+        ),
+        "callouts": (
+            ("\\n💡 Our Solution:", {"size": Pt(20), "bold": True}),
+            ("Olympus-Coder: An AI assistant that codes like a senior developer",
+             {"size": Pt(18), "color": _ACCENT_BLUE})
+        )
+    },
+    {
+        # Slide 3: What is Olympus-Coder
+        "title": "Meet Your New AI Coding Partner",
+        "intro": "🏛️ Core Features:",
+        "bullets": (
+            "🧠 Built on CodeLlama 13B - Industry-leading code generation model",
+            "🎯 Specialized Prompts - Custom-trained for software development",
+            "🔒 Privacy-First - Runs entirely on your machine",
+            "🌍 Multi-Language - Python, JavaScript, Java, Go, Rust, C++",
+            "🔧 IDE Integration - VS Code, JetBrains, Vim, Sublime Text",
+            "⚡ Instant Setup - 30 seconds to productivity"
+        )
+    },
+    {
+        # Slide 4: Performance Metrics
+        "title": "Proven Results in Real-World Testing",
+        "intro": "📊 Performance Data:",
+        "bullets": (
+            "Response Accuracy: 97.3% (Target: >95%)",
+            "Code Syntax Correctness: 99.1% (Target: >98%)",
+            "Task Completion Rate: 78.5% (Target: >75%)",
+            "Average Response Time: 3.2s (Target: <5s)"
+        ),
+        "callouts": (
+            ("\\n🚀 Productivity Impact: 4-6x Faster Development",
+             {"size": Pt(20), "bold": True, "color": _GREEN}),
+        )
+    },
+    {
+        # Slide 5: Core Capabilities
+        "title": "What Olympus-Coder Can Do For You",
+        "intro": "Four Core Capabilities:",
+        "bullets": (
+            "🎯 Code Generation - Natural language to working code",
+            "🐛 Intelligent Debugging - Error analysis and fix recommendations", 
+            "📚 Code Explanation - Algorithm breakdown in plain English",
+            "🧪 Test Generation - Comprehensive unit test suites"
+        )
+    },
+    {
+        # Slide 6: Simple Setup
+        "title": "Get Started in 30 Seconds",
+        "intro": "Installation Process:",
+        "bullets": (
+            "# Step 1: Install Ollama (if not already installed)",
+            "curl -fsSL https://ollama.com/install.sh | sh",
+            "",
+            "# Step 2: Pull Olympus-Coder (30 seconds)",
+            "ollama pull aadi19/olympus-coder",
+            "",
+            "# Step 3: Start coding!",
+            'ollama run aadi19/olympus-coder "Create a function"'
+        ),
+        "style": _prefix_style(_STEP_STYLERS)
+    },
+    {
+        # Slide 7: ROI Calculation
+        "title": "Return on Investment Analysis",
+        "intro": "💰 Investment vs Returns:",
+        "bullets": (
+            "Setup Time: 2 hours per developer (one-time)",
+            "Training: 1 hour per developer (one-time)", 
+            "Software Cost: $0 (completely free)",
+            "",
+            "📈 Returns per Developer/Month:",
+            "Time Saved: 40+ hours/month",
+            "Value at $100/hour: $4,000/month",
+            "Annual Value: $48,000/developer",
+            "",
+            "🏢 Team of 10 Developers:",
+            "Annual Productivity Gain: $480,000",
+            "ROI: 160,000% in first year"
+        ),
+        "style": _roi_style
+    },
+    {
+        # Final slide: Thank You
+        "title": "Ready to Transform Our Development Process?",
+        "intro": "🎉 Key Takeaways:",
+        "bullets": (
+            "✅ 4-6x productivity increase proven in testing",
+            "✅ Privacy-first local execution",
+            "✅ Zero cost open-source solution", 
+            "✅ Easy integration with existing workflow",
+            "✅ Immediate impact from day one",
+            "✅ Global availability right now",
+            "",
+            "🚀 Get Started Today:",
+            "ollama pull aadi19/olympus-coder",
+            'ollama run aadi19/olympus-coder "Hello, let\'s boost productivity!"',
+            "",
+            "GitHub: https://github.com/chandan1819/olympus-coder",
+            "Ollama: https://ollama.com/aadi19/olympus-coder"
+        ),
+        "style": _prefix_style(_TAKEAWAY_STYLERS)
+    },
+)
+
+def _bulk_add_paragraphs(tf, items, level=1, style=None):
+    """Append one bullet paragraph per item straight to the text frame XML.
+    
+    Builds the same <a:p> markup as tf.add_paragraph() plus setting text,
+    level and font, without going through python-pptx's proxy objects for
+    every item. ``style(item)`` may return a dict with any of ``level``,
+    ``size`` (Length), ``bold``, ``color`` (RGBColor) and ``font_name``
+    for that item.
+    """
+    txBody = tf._txBody
+    for item in items:
+        props = style(item) if style is not None else None
+        props = props or {}
+        item_level = props.get("level", level)
+        
+        p = etree.SubElement(txBody, qn("a:p"))
+        pPr = etree.SubElement(p, qn("a:pPr"))
+        if item_level:
+            pPr.set("lvl", str(item_level))
+        
+        if props.keys() - {"level"}:
+            defRPr = etree.SubElement(pPr, qn("a:defRPr"))
+            if "size" in props:
+                defRPr.set("sz", str(props["size"].centipoints))
+            if props.get("bold"):
+                defRPr.set("b", "1")
+            if "color" in props:
+                fill = etree.SubElement(defRPr, qn("a:solidFill"))
+                etree.SubElement(fill, qn("a:srgbClr")).set("val", str(props["color"]))
+            if "font_name" in props:
+                etree.SubElement(defRPr, qn("a:latin")).set("typeface", props["font_name"])
+        
+        if item:
+            r = etree.SubElement(p, qn("a:r"))
+            etree.SubElement(r, qn("a:t")).text = item
+
+def _render_slide(prs, layout, spec):
+    """Add a title-and-content slide described by a slide spec dict"""
+    slide = prs.slides.add_slide(layout)
+    slide.shapes.title.text = spec["title"]
+    
+    tf = slide.placeholders[1].text_frame
+    tf.text = spec["intro"]
+    _bulk_add_paragraphs(tf, spec["bullets"], style=spec.get("style"))
+    
+    callouts = spec.get("callouts")
+    if callouts:
+        _bulk_add_paragraphs(tf, [text for text, _ in callouts], level=0,
+                             style=dict(callouts).get)
 
 def create_olympus_coder_presentation():
     """Create the Olympus-Coder team demo PowerPoint presentation"""
     
     # Create presentation
-    prs = Presentation()
+    prs = Presentation(_TEMPLATE_PATH if os.path.exists(_TEMPLATE_PATH) else None)
     
-    # Define colors
-    DARK_BLUE = RGBColor(13, 27, 42)
-    LIGHT_BLUE = RGBColor(27, 38, 59)
-    ACCENT_BLUE = RGBColor(65, 105, 225)
-    WHITE = RGBColor(255, 255, 255)
-    GREEN = RGBColor(46, 125, 50)
+    # Look the layouts up once rather than per slide
+    title_layout = prs.slide_layouts[0]  # Title slide layout
+    content_layout = prs.slide_layouts[1]  # Title and content layout
     
     # Slide 1: Title Slide
-    slide_layout = prs.slide_layouts[0]  # Title slide layout
-    slide = prs.slides.add_slide(slide_layout)
+    slide = prs.slides.add_slide(title_layout)
     
     title = slide.shapes.title
     subtitle = slide.placeholders[1]
     
     title.text = "🏛️ Olympus-Coder"
     title.text_frame.paragraphs[0].font.size = Pt(54)
-    title.text_frame.paragraphs[0].font.color.rgb = DARK_BLUE
+    title.text_frame.paragraphs[0].font.color.rgb = _DARK_BLUE
     
     subtitle.text = "AI-Powered Coding Assistant\\nBoost Team Productivity by 4-6x\\n\\nNow Available Worldwide\\nollama.com/aadi19/olympus-coder"
     subtitle.text_frame.paragraphs[0].font.size = Pt(24)
     
-    # Slide 2: The Problem
-    slide_layout = prs.slide_layouts[1]  # Title and content layout
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Development Challenges We Face Daily"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "Current Pain Points:"
-    
-    problems = [
-        "⏰ Time-consuming repetitive coding tasks",
-        "🐛 Complex debugging processes taking hours", 
-        "📚 Learning new algorithms and patterns",
-        "🔄 Writing comprehensive test cases",
-        "📝 Creating documentation and comments",
-        "💸 High development costs and tight deadlines"
-    ]
-    
-    for problem in problems:
-        p = tf.add_paragraph()
-        p.text = problem
-        p.level = 1
-    
-    # Add solution callout
-    p = tf.add_paragraph()
-    p.text = "\\n💡 Our Solution:"
-    p.font.size = Pt(20)
-    p.font.bold = True
-    
-    p = tf.add_paragraph()
-    p.text = "Olympus-Coder: An AI assistant that codes like a senior developer"
-    p.font.size = Pt(18)
-    p.font.color.rgb = ACCENT_BLUE
-    
-    # Slide 3: What is Olympus-Coder
-    slide = prs.slides.add_slide(prs.slide_layouts[1])
-    title = slide.shapes.title
-    title.text = "Meet Your New AI Coding Partner"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "🏛️ Core Features:"
-    
-    features = [
-        "🧠 Built on CodeLlama 13B - Industry-leading code generation model",
-        "🎯 Specialized Prompts - Custom-trained for software development",
-        "🔒 Privacy-First - Runs entirely on your machine",
-        "🌍 Multi-Language - Python, JavaScript, Java, Go, Rust, C++",
-        "🔧 IDE Integration - VS Code, JetBrains, Vim, Sublime Text",
-        "⚡ Instant Setup - 30 seconds to productivity"
-    ]
-    
-    for feature in features:
-        p = tf.add_paragraph()
-        p.text = feature
-        p.level = 1
-    
-    # Slide 4: Performance Metrics
-    slide = prs.slides.add_slide(prs.slide_layouts[1])
-    title = slide.shapes.title
-    title.text = "Proven Results in Real-World Testing"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "📊 Performance Data:"
-    
-    metrics = [
-        "Response Accuracy: 97.3% (Target: >95%)",
-        "Code Syntax Correctness: 99.1% (Target: >98%)",
-        "Task Completion Rate: 78.5% (Target: >75%)",
-        "Average Response Time: 3.2s (Target: <5s)"
-    ]
-    
-    for metric in metrics:
-        p = tf.add_paragraph()
-        p.text = metric
-        p.level = 1
-    
-    p = tf.add_paragraph()
-    p.text = "\\n🚀 Productivity Impact: 4-6x Faster Development"
-    p.font.size = Pt(20)
-    p.font.bold = True
-    p.font.color.rgb = GREEN
-    
-    # Slide 5: Core Capabilities
-    slide = prs.slides.add_slide(prs.slide_layouts[1])
-    title = slide.shapes.title
-    title.text = "What Olympus-Coder Can Do For You"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "Four Core Capabilities:"
-    
-    capabilities = [
-        "🎯 Code Generation - Natural language to working code",
-        "🐛 Intelligent Debugging - Error analysis and fix recommendations", 
-        "📚 Code Explanation - Algorithm breakdown in plain English",
-        "🧪 Test Generation - Comprehensive unit test suites"
-    ]
-    
-    for capability in capabilities:
-        p = tf.add_paragraph()
-        p.text = capability
-        p.level = 1
-    
-    # Slide 6: Simple Setup
-    slide = prs.slides.add_slide(prs.slide_layouts[1])
-    title = slide.shapes.title
-    title.text = "Get Started in 30 Seconds"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "Installation Process:"
-    
-    steps = [
-        "# Step 1: Install Ollama (if not already installed)",
-        "curl -fsSL https://ollama.com/install.sh | sh",
-        "",
-        "# Step 2: Pull Olympus-Coder (30 seconds)",
-        "ollama pull aadi19/olympus-coder",
-        "",
-        "# Step 3: Start coding!",
-        'ollama run aadi19/olympus-coder "Create a function"'
-    ]
-    
-    for step in steps:
-        p = tf.add_paragraph()
-        p.text = step
-        p.level = 1
-        if step.startswith("#"):
-            p.font.color.rgb = GREEN
-            p.font.bold = True
-        elif step.startswith("ollama") or step.startswith("curl"):
-            p.font.name = "Courier New"
-    
-    # Continue with more slides...
-    # For brevity, I'll add a few more key slides
-    
-    # Slide 7: ROI Calculation
-    slide = prs.slides.add_slide(prs.slide_layouts[1])
-    title = slide.shapes.title
-    title.text = "Return on Investment Analysis"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "💰 Investment vs Returns:"
-    
-    roi_points = [
-        "Setup Time: 2 hours per developer (one-time)",
-        "Training: 1 hour per developer (one-time)", 
-        "Software Cost: $0 (completely free)",
-        "",
-        "📈 Returns per Developer/Month:",
-        "Time Saved: 40+ hours/month",
-        "Value at $100/hour: $4,000/month",
-        "Annual Value: $48,000/developer",
-        "",
-        "🏢 Team of 10 Developers:",
-        "Annual Productivity Gain: $480,000",
-        "ROI: 160,000% in first year"
-    ]
-    
-    for point in roi_points:
-        p = tf.add_paragraph()
-        p.text = point
-        p.level = 1 if not point.startswith(("📈", "🏢")) else 0
-        if "160,000%" in point:
-            p.font.color.rgb = GREEN
-            p.font.bold = True
-    
-    # Final slide: Thank You
-    slide = prs.slides.add_slide(prs.slide_layouts[1])
-    title = slide.shapes.title
-    title.text = "Ready to Transform Our Development Process?"
-    
-    content = slide.placeholders[1]
-    tf = content.text_frame
-    tf.text = "🎉 Key Takeaways:"
-    
-    takeaways = [
-        "✅ 4-6x productivity increase proven in testing",
-        "✅ Privacy-first local execution",
-        "✅ Zero cost open-source solution", 
-        "✅ Easy integration with existing workflow",
-        "✅ Immediate impact from day one",
-        "✅ Global availability right now",
-        "",
-        "🚀 Get Started Today:",
-        "ollama pull aadi19/olympus-coder",
-        'ollama run aadi19/olympus-coder "Hello, let\'s boost productivity!"',
-        "",
-        "GitHub: https://github.com/chandan1819/olympus-coder",
-        "Ollama: https://ollama.com/aadi19/olympus-coder"
-    ]
-    
-    for takeaway in takeaways:
-        p = tf.add_paragraph()
-        p.text = takeaway
-        p.level = 1
-        if takeaway.startswith("ollama"):
-            p.font.name = "Courier New"
-        elif takeaway.startswith(("GitHub:", "Ollama:")):
-            p.font.color.rgb = ACCENT_BLUE
+    for spec in _SLIDES:
+        _render_slide(prs, content_layout, spec)
     
     return prs
 
@@ -12,79 +12,151 @@ import subprocess
 import time
 import sys
 import os
+import threading
 from datetime import datetime
 
 class TeamDemo:
+    # Header and conclusion are written in one go rather than line by line
+    HEADER_TEMPLATE = """\
+================================================================================
+🏛️  OLYMPUS-CODER TEAM DEMONSTRATION
+   AI-Powered Coding Assistant - Live Demo
+================================================================================
+📅 Demo Date: {date}
+🤖 Model: {model}
+🔗 Available at: https://ollama.com/{model}
+
+🎯 Today's Demo Goals:
+• Show 4-6x productivity improvement
+• Demonstrate key features live
+• Prove real-world applicability
+• Address team questions and concerns
+
+"""
+    
+    CONCLUSION_TEMPLATE = """
+================================================================================
+🎉 TEAM DEMO COMPLETE!
+================================================================================
+
+📊 What You Just Saw:
+✅ Natural language → Working code in seconds
+✅ Intelligent error detection and fixes
+✅ Complex algorithm explanation made simple
+✅ Automated test generation with edge cases
+✅ Complete API development assistance
+
+🚀 Productivity Benefits:
+• 4-6x faster development
+• Higher code quality
+• Reduced debugging time
+• Better documentation
+• Continuous learning
+
+🔒 Privacy Benefits:
+• Runs entirely on your machine
+• No code sent to external servers
+• Complete control over your data
+
+🛠️ Easy Integration:
+• Works with VS Code, JetBrains, Vim, Sublime
+• Simple command-line interface
+• 30-second installation
+
+📈 Expected ROI:
+• 2+ hours saved per developer per day
+• $4,000+ monthly savings per developer
+• Faster feature delivery
+• Improved code quality
+
+🎯 Next Steps:
+1. Volunteer pilot group (who's interested?)
+2. Install on development machines
+3. Start with non-critical projects
+4. Measure and share results
+
+🔗 Resources:
+• Ollama: https://ollama.com/{model}
+• GitHub: https://github.com/chandan1819/olympus-coder
+• Documentation: Complete guides included
+
+❓ Questions? Let's discuss how this can transform our development process!
+"""
+    
     def __init__(self):
         self.model_name = "aadi19/olympus-coder"
+        # Result of check_prerequisites, so `ollama list` runs at most once
+        self._prereq_cache = None
         self.demo_scenarios = [
             {
                 "title": "🚀 Code Generation",
                 "description": "Generate a complete Python function from natural language",
-                "command": f'ollama run {self.model_name} "Create a Python function to validate email addresses with regex, include error handling and docstring"',
+                "prompt": "Create a Python function to validate email addresses with regex, include error handling and docstring",
                 "explanation": "Watch how natural language becomes working code with documentation",
                 "time_estimate": "30-45 seconds"
             },
             {
                 "title": "🐛 Debugging Assistant", 
                 "description": "Identify and fix a common programming error",
-                "command": f'ollama run {self.model_name} "Debug this function and explain the issue: def get_last_item(items): return items[len(items)]"',
+                "prompt": "Debug this function and explain the issue: def get_last_item(items): return items[len(items)]",
                 "explanation": "AI identifies the off-by-one error and provides the fix with explanation",
                 "time_estimate": "20-30 seconds"
             },
             {
                 "title": "📚 Algorithm Explanation",
                 "description": "Explain a complex algorithm in simple terms",
-                "command": f'ollama run {self.model_name} "Explain how this quicksort algorithm works step by step: def quicksort(arr): return arr if len(arr) <= 1 else quicksort([x for x in arr[1:] if x < arr[0]]) + [arr[0]] + quicksort([x for x in arr[1:] if x >= arr[0]])"',
+                "prompt": "Explain how this quicksort algorithm works step by step: def quicksort(arr): return arr if len(arr) <= 1 else quicksort([x for x in arr[1:] if x < arr[0]]) + [arr[0]] + quicksort([x for x in arr[1:] if x >= arr[0]])",
                 "explanation": "Perfect for understanding unfamiliar code or learning new algorithms",
                 "time_estimate": "45-60 seconds"
             },
             {
                 "title": "🧪 Test Generation",
                 "description": "Automatically create comprehensive unit tests",
-                "command": f'ollama run {self.model_name} "Generate unit tests for this function: def calculate_discount(price, discount_percent): return price * (1 - discount_percent / 100) if 0 <= discount_percent <= 100 else price"',
+                "prompt": "Generate unit tests for this function: def calculate_discount(price, discount_percent): return price * (1 - discount_percent / 100) if 0 <= discount_percent <= 100 else price",
                 "explanation": "Creates test cases including edge cases and error conditions",
                 "time_estimate": "30-45 seconds"
             },
             {
                 "title": "🌐 API Development",
                 "description": "Generate a REST API endpoint",
-                "command": f'ollama run {self.model_name} "Create a Flask API endpoint for user registration with validation and error handling"',
+                "prompt": "Create a Flask API endpoint for user registration with validation and error handling",
                 "explanation": "Complete API code with proper structure and error handling",
                 "time_estimate": "45-60 seconds"
             }
         ]
+        
+        # Commands run without a shell, so prompts need no quoting; the
+        # display form is what the audience would type themselves
+        for scenario in self.demo_scenarios:
+            scenario["argv"] = ["ollama", "run", self.model_name, scenario["prompt"]]
+            scenario["display_command"] = f'ollama run {self.model_name} "{scenario["prompt"]}"'
     
     def print_demo_header(self):
         """Print professional demo header"""
-        print("=" * 80)
-        print("🏛️  OLYMPUS-CODER TEAM DEMONSTRATION")
-        print("   AI-Powered Coding Assistant - Live Demo")
-        print("=" * 80)
-        print(f"📅 Demo Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        print(f"🤖 Model: {self.model_name}")
-        print(f"🔗 Available at: https://ollama.com/{self.model_name}")
-        print()
-        print("🎯 Today's Demo Goals:")
-        print("• Show 4-6x productivity improvement")
-        print("• Demonstrate key features live")
-        print("• Prove real-world applicability")
-        print("• Address team questions and concerns")
-        print()
+        sys.stdout.write(self.HEADER_TEMPLATE.format(
+            date=datetime.now().strftime('%Y-%m-%d %H:%M'), model=self.model_name))
+        sys.stdout.flush()
     
     def check_prerequisites(self):
-        """Check if everything is ready for demo"""
+        """Check if everything is ready for demo (once; later calls reuse the result)"""
+        if self._prereq_cache is None:
+            self._prereq_cache = self._run_prerequisite_check()
+        return self._prereq_cache
+    
+    def _run_prerequisite_check(self):
+        """Run `ollama list` and report whether the demo model is available"""
         print("🔍 Pre-Demo System Check")
         print("-" * 40)
         
         # Check if Ollama is running
         try:
-            result = subprocess.run(["ollama", "list"], capture_output=True, text=True, timeout=5)
+            # Raw bytes: the output is only searched, never shown
+            result = subprocess.run(["ollama", "list"], capture_output=True, timeout=5)
             if result.returncode == 0:
                 print("✅ Ollama service is running")
                 
                 # Check if our model is available
-                if self.model_name in result.stdout:
+                if self.model_name.encode() in result.stdout:
                     print(f"✅ {self.model_name} model is available")
                     return True
                 else:
@@ -110,34 +182,68 @@ class TeamDemo:
         input("👥 [Press Enter when audience is ready...]")
         
         print("🔧 Command being executed:")
-        print(f"   {scenario['command']}")
+        print(f"   {scenario['display_command']}")
         print()
         print("⏳ Running... (live generation in progress)")
         print()
         
-        # Execute the command
+        # Execute the command, showing the output as it is generated
         try:
             start_time = time.time()
-            result = subprocess.run(scenario['command'], shell=True, capture_output=True, text=True, timeout=120)
+            # On a terminal, token chunks are copied as raw bytes straight to
+            # the output fd as soon as they arrive; otherwise (CI, logs) the
+            # output is passed through line by line as text
+            live = sys.stdout.isatty()
+            proc = subprocess.Popen(scenario['argv'], stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, text=not live,
+                                    bufsize=0 if live else 1)
+            # Reading blocks until the model writes, so the time limit is
+            # enforced by killing the process from a timer
+            timed_out = []
+            timer = threading.Timer(120, lambda: (timed_out.append(True), proc.kill()))
+            timer.start()
+            try:
+                print("📤 Generated Output:")
+                print("─" * 50)
+                sys.stdout.flush()
+                if live:
+                    fd = sys.stdout.fileno()
+                    # Unbuffered pipe: read() returns whatever is available
+                    chunk = proc.stdout.read(4096)
+                    while chunk:
+                        # os.write may take only part of the chunk on a pipe
+                        view = memoryview(chunk)
+                        while view:
+                            view = view[os.write(fd, view):]
+                        chunk = proc.stdout.read(4096)
+                else:
+                    for line in proc.stdout:
+                        sys.stdout.write(line)
+                        sys.stdout.flush()
+                proc.wait()
+            finally:
+                timer.cancel()
+                # Ctrl+C (or any error) while streaming must not leave ollama running
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                proc.stdout.close()
             end_time = time.time()
+            print("─" * 50)
+            print()
             
-            if result.returncode == 0:
+            if timed_out:
+                print("⏰ Response taking longer than expected - this can happen with complex requests")
+                print("💡 In real usage, you'd get the response - let's continue with next demo")
+            elif proc.returncode == 0:
                 print("✅ SUCCESS!")
                 print(f"⚡ Response time: {end_time - start_time:.1f} seconds")
                 print()
-                print("📤 Generated Output:")
-                print("─" * 50)
-                print(result.stdout)
-                print("─" * 50)
-                print()
                 print(f"💡 Key Point: {scenario['explanation']}")
             else:
                 print("❌ Demo failed - using backup example")
                 self.show_backup_example(scenario_num)
                 
-        except subprocess.TimeoutExpired:
-            print("⏰ Response taking longer than expected - this can happen with complex requests")
-            print("💡 In real usage, you'd get the response - let's continue with next demo")
         except Exception as e:
             print(f"❌ Error: {e}")
             self.show_backup_example(scenario_num)
@@ -299,54 +405,56 @@ def register_user():
         self.print_demo_conclusion()
         return True
     
+    def run_scenarios_parallel(self, scenarios):
+        """Run scenario commands concurrently; returns (result, seconds) per scenario in order"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def run(scenario):
+            start_time = time.time()
+            try:
+                result = subprocess.run(scenario['argv'], capture_output=True, text=True, timeout=120)
+            except subprocess.TimeoutExpired:
+                result = None
+            except OSError as e:
+                # e.g. ollama not on PATH; reported like a failed command
+                result = subprocess.CompletedProcess(scenario['argv'], 127, "", str(e))
+            return result, time.time() - start_time
+        
+        # Ollama answers these together only up to OLLAMA_NUM_PARALLEL;
+        # beyond that they queue on the server, which is still no slower
+        with ThreadPoolExecutor(max_workers=len(scenarios)) as pool:
+            return list(pool.map(run, scenarios))
+    
+    def run_team_demo_parallel(self, count=None):
+        """Run the demo scenarios non-interactively, all at once, and show them in order"""
+        scenarios = self.demo_scenarios[:count]
+        
+        if not self.check_prerequisites():
+            print("\n❌ Demo prerequisites not met!")
+            print("Please ensure Ollama is running and the model is available.")
+            return False
+        
+        print(f"\n⏳ Running {len(scenarios)} demos in parallel...")
+        start_time = time.time()
+        results = self.run_scenarios_parallel(scenarios)
+        print(f"⚡ All demos finished in {time.time() - start_time:.1f} seconds")
+        
+        for i, (scenario, (result, elapsed)) in enumerate(zip(scenarios, results), 1):
+            print(f"\n--- Demo {i}: {scenario['title']} ({elapsed:.1f}s) ---")
+            if result is None:
+                print("⏰ Response taking longer than expected - showing backup example")
+                self.show_backup_example(i)
+            elif result.returncode == 0:
+                print(result.stdout)
+            else:
+                print("❌ Demo failed - using backup example")
+                self.show_backup_example(i)
+        return True
+    
     def print_demo_conclusion(self):
         """Print demo conclusion and next steps"""
-        print("\n" + "=" * 80)
-        print("🎉 TEAM DEMO COMPLETE!")
-        print("=" * 80)
-        print()
-        print("📊 What You Just Saw:")
-        print("✅ Natural language → Working code in seconds")
-        print("✅ Intelligent error detection and fixes")
-        print("✅ Complex algorithm explanation made simple")
-        print("✅ Automated test generation with edge cases")
-        print("✅ Complete API development assistance")
-        print()
-        print("🚀 Productivity Benefits:")
-        print("• 4-6x faster development")
-        print("• Higher code quality")
-        print("• Reduced debugging time")
-        print("• Better documentation")
-        print("• Continuous learning")
-        print()
-        print("🔒 Privacy Benefits:")
-        print("• Runs entirely on your machine")
-        print("• No code sent to external servers")
-        print("• Complete control over your data")
-        print()
-        print("🛠️ Easy Integration:")
-        print("• Works with VS Code, JetBrains, Vim, Sublime")
-        print("• Simple command-line interface")
-        print("• 30-second installation")
-        print()
-        print("📈 Expected ROI:")
-        print("• 2+ hours saved per developer per day")
-        print("• $4,000+ monthly savings per developer")
-        print("• Faster feature delivery")
-        print("• Improved code quality")
-        print()
-        print("🎯 Next Steps:")
-        print("1. Volunteer pilot group (who's interested?)")
-        print("2. Install on development machines")
-        print("3. Start with non-critical projects")
-        print("4. Measure and share results")
-        print()
-        print("🔗 Resources:")
-        print(f"• Ollama: https://ollama.com/{self.model_name}")
-        print("• GitHub: https://github.com/chandan1819/olympus-coder")
-        print("• Documentation: Complete guides included")
-        print()
-        print("❓ Questions? Let's discuss how this can transform our development process!")
+        sys.stdout.write(self.CONCLUSION_TEMPLATE.format(model=self.model_name))
+        sys.stdout.flush()
 
 def main():
     """Main demo function with options"""
@@ -358,6 +466,7 @@ def main():
             print("Options:")
             print("  -h, --help     Show this help message")
             print("  -q, --quick    Run quick automated demo")
+            print("      --parallel With -q, run the demos at once and print them in order")
             print("  -c, --check    Check prerequisites only")
             print()
             print("This script provides an interactive demo perfect for team presentations")
@@ -369,10 +478,12 @@ def main():
         elif sys.argv[1] in ['-q', '--quick']:
             print("🚀 Quick Automated Demo")
             demo = TeamDemo()
-            if demo.check_prerequisites():
+            if '--parallel' in sys.argv[2:]:
+                demo.run_team_demo_parallel(3)
+            elif demo.check_prerequisites():
                 for i, scenario in enumerate(demo.demo_scenarios[:3], 1):
                     print(f"\n--- Demo {i}: {scenario['title']} ---")
-                    subprocess.run(scenario['command'], shell=True)
+                    subprocess.run(scenario['argv'])
                     time.sleep(2)
             return
     
@@ -20,7 +20,10 @@ def run_unit_tests():
     
     test_files = [
         "test_ollama_client.py",
-        "test_agentic_adapter.py"
+        "test_agentic_adapter.py",
+        "test_logging_tools.py",
+        "test_utils.py",
+        "test_ide_core.py"
     ]
     
     test_dir = Path(__file__).parent
@@ -5,6 +5,7 @@ Tests the AgenticAdapter functionality including context management,
 tool execution, and framework integration patterns.
 """
 
+import asyncio
 import json
 import pytest
 import time
@@ -15,7 +16,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from integration.agentic_adapter import (
-    AgenticAdapter, AgentContext, AgentResponse, AgentState,
+    AgenticAdapter, AgentContext, AgentResponse, AgentState, ConversationHistory,
     create_default_adapter, create_context_from_task
 )
 from integration.ollama_client import OllamaClient, ModelResponse
@@ -50,6 +51,35 @@ class TestAgentContext:
         assert context.conversation_history[0]["content"] == "Hello"
         assert context.conversation_history[1]["role"] == "assistant"
         assert context.conversation_history[1]["content"] == "Hi there!"
+
+    def test_conversation_history_from_list(self):
+        """Test that plain message lists are stored column-wise"""
+        messages = [
+            {"role": "user", "content": "Hello", "timestamp": 1.0},
+            {"role": "assistant", "content": "Hi", "timestamp": 2.0}
+        ]
+        context = AgentContext("test-task", "Test task", conversation_history=messages)
+
+        assert isinstance(context.conversation_history, ConversationHistory)
+        assert context.conversation_history == messages
+        assert context.conversation_history[-1:] == messages[-1:]
+        assert context.to_dict()["conversation_history"] == messages
+
+    def test_conversation_history_keeps_extra_keys(self):
+        """Test that extra keys and missing timestamps survive the column store"""
+        messages = [
+            {"role": "tool", "content": "42", "tool_call_id": "call-1", "name": "calc"},
+            {"role": "user", "content": "Thanks", "timestamp": None}
+        ]
+        history = ConversationHistory(messages)
+
+        assert history.to_list() == messages
+        assert history[0]["tool_call_id"] == "call-1"
+        assert "timestamp" not in history[0]
+
+        # Items are read-only views, so edits fail loudly instead of being lost
+        with pytest.raises(TypeError):
+            history[-1]["content"] = "changed"
     
     def test_add_file(self):
         """Test adding file to context"""
@@ -61,7 +91,19 @@ class TestAgentContext:
         assert context.files[0]["path"] == "test.py"
         assert context.files[0]["content"] == "print('hello')"
         assert context.files[0]["language"] == "python"
-    
+
+    def test_add_file_shares_large_contents(self):
+        """Test that identical large files are stored once across contexts"""
+        content = "x = 1\n" * 1000
+        first = AgentContext("task-1", "Test task")
+        second = AgentContext("task-2", "Test task")
+
+        first.add_file("a.py", content)
+        second.add_file("b.py", "".join(["x = 1\n"] * 1000))
+
+        assert first.files[0]["content"] is second.files[0]["content"]
+        assert first.files[0]["content"] == content
+
     def test_set_error(self):
         """Test setting error context"""
         context = AgentContext("test-task", "Test task")
@@ -95,6 +137,36 @@ class TestAgentContext:
         assert len(restored_context.files) == len(context.files)
         assert len(restored_context.conversation_history) == len(context.conversation_history)
 
+    def test_formatted_context_cache(self):
+        """Test that the formatted context is reused until files change"""
+        context = AgentContext("test-task", "Test task")
+        context.add_file("test.py", "print('hello')")
+        context.add_message("user", "Hello")
+
+        first = context.formatted_context()
+        cached = context._cached_format
+        context.add_message("assistant", "Hi there!")
+        second = context.formatted_context()
+
+        assert context._cached_format is cached
+        assert "**Assistant:** Hi there!" in second
+        assert second.startswith(first.split("## Recent Context")[0])
+
+        context.add_file("other.py", "x = 1")
+        assert "### other.py" in context.formatted_context()
+
+    def test_formatted_context_sees_in_place_edits(self):
+        """Test that editing files or the project structure in place refreshes the cache"""
+        context = AgentContext("test-task", "Test task", project_structure={"src": {}})
+        context.add_file("test.py", "print('hello')")
+        context.formatted_context()
+
+        context.files[0]["content"] = "print('changed')"
+        assert "print('changed')" in context.formatted_context()
+
+        context.project_structure["docs"] = {}
+        assert "docs/" in context.formatted_context()
+
 
 class TestAgentResponse:
     """Test cases for AgentResponse class"""
@@ -136,6 +208,23 @@ class TestAgentResponse:
         # Error state
         response3 = AgentResponse(content="", state=AgentState.ERROR)
         assert response3.is_successful() is False
+        
+        # Error state that is not the interned constant, e.g. loaded from JSON
+        response4 = AgentResponse(content="", state="".join(["err", "or"]))
+        assert response4.is_successful() is False
+
+    def test_reset_reuses_metadata(self):
+        """Test that reset reinitializes fields in place"""
+        response = AgentResponse(content="Old", error="boom", metadata={"stale": True})
+        metadata = response.metadata
+
+        response.reset("New", token_count=3, metadata={"fresh": True})
+
+        assert response.content == "New"
+        assert response.error is None
+        assert response.token_count == 3
+        assert response.metadata is metadata
+        assert response.metadata == {"fresh": True}
 
 
 class TestAgenticAdapter:
@@ -179,7 +268,22 @@ class TestAgenticAdapter:
         assert len(context.conversation_history) == 2
         assert context.conversation_history[0]["role"] == "user"
         assert context.conversation_history[1]["role"] == "assistant"
-    
+
+    def test_execute_task_truncation_keeps_request(self):
+        """Test that truncation trims the context but never the request"""
+        self.mock_client.generate.return_value = self.mock_model_response
+        adapter = AgenticAdapter(self.mock_client, max_context_length=200)
+
+        context = AgentContext("test-task", "Task")
+        context.add_file("big.py", "\n".join(f"line_{i} = {i}" for i in range(500)))
+        prompt = "Fix the bug " * 10
+
+        adapter.execute_task(context, prompt)
+
+        sent = self.mock_client.generate.call_args.kwargs["prompt"]
+        assert sent.startswith("[Context truncated...]")
+        assert sent.endswith("## Request\n" + prompt)
+
     def test_execute_task_with_tool_request(self):
         """Test task execution that returns tool request"""
         # Setup model response with tool request
@@ -227,7 +331,71 @@ class TestAgenticAdapter:
         assert response.state == AgentState.ERROR
         assert response.error == "Model error"
         assert context.error_context is not None
-    
+
+    def test_execute_task_async(self):
+        """Test concurrent async task execution with sync and async hooks"""
+        self.mock_client.agenerate.return_value = self.mock_model_response
+        calls = []
+
+        async def pre_hook(context, prompt):
+            calls.append(("pre", context.task_id))
+
+        def post_hook(context, response):
+            calls.append(("post", context.task_id))
+
+        self.adapter.add_pre_execution_hook(pre_hook)
+        self.adapter.add_post_execution_hook(post_hook)
+        contexts = [AgentContext(f"task-{i}", "Test task") for i in range(3)]
+
+        async def run_all():
+            return await asyncio.gather(
+                *(self.adapter.execute_task_async(c, "Test prompt") for c in contexts)
+            )
+
+        responses = asyncio.run(run_all())
+
+        assert all(r.is_successful() for r in responses)
+        assert self.mock_client.agenerate.await_count == 3
+        assert len(calls) == 6
+        assert all(len(c.conversation_history) == 2 for c in contexts)
+
+    def test_execute_task_streaming_stops_at_tool_request(self):
+        """Test that streaming stops reading once a tool request is complete"""
+        pieces = ['I will read it.\n```json\n{"tool_name": "read_file", ',
+                  '"parameters": {"file_path": "a.py"}}\n```',
+                  ' and then some more text']
+        consumed = []
+
+        def generate_stream(prompt, system_prompt=None, options=None):
+            for piece in pieces:
+                consumed.append(piece)
+                yield ModelResponse(content=piece, model="test-model",
+                                    created_at="", done=False)
+
+        self.mock_client.generate_stream = generate_stream
+        tokens = []
+        context = AgentContext("test-task", "Test task")
+
+        response = self.adapter.execute_task_streaming(context, "Read a.py",
+                                                       on_token=tokens.append)
+
+        assert response.is_successful()
+        assert response.tool_request.tool_name == "read_file"
+        assert response.metadata["stopped_early"] is True
+        assert consumed == pieces[:2]
+        assert tokens == pieces[:2]
+
+    def test_execute_task_streaming_without_stream_api(self):
+        """Test that streaming falls back to a single generate call"""
+        del self.mock_client.generate_stream
+        self.mock_client.generate.return_value = self.mock_model_response
+        context = AgentContext("test-task", "Test task")
+
+        response = self.adapter.execute_task_streaming(context, "Test prompt")
+
+        assert response.content == "Generated response content"
+        assert "stopped_early" not in response.metadata
+
     def test_register_tool_handler(self):
         """Test registering tool handler"""
         def mock_handler(params, context):
@@ -299,20 +467,25 @@ class TestAgenticAdapter:
         missing = self.adapter.get_context("missing-task")
         assert missing is None
     
-    def test_save_load_context(self):
+    def test_save_load_context(self, tmp_path):
         """Test context persistence"""
         context = AgentContext("test-task", "Test task")
         context.add_message("user", "Hello")
-        
-        # Mock file operations
-        with patch('builtins.open', create=True) as mock_open:
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-            
-            # Test save
-            self.adapter.save_context(context, "test_context.json")
-            mock_open.assert_called_with("test_context.json", 'w')
-            mock_file.write.assert_called()
+        file_path = str(tmp_path / "test_context.json")
+        
+        # Test save
+        self.adapter.save_context(context, file_path)
+        assert os.path.exists(file_path)
+        assert not os.path.exists(file_path + ".tmp")
+        with open(file_path) as f:
+            assert json.load(f)["task_id"] == "test-task"
+        
+        # Test load
+        self.adapter.active_contexts.clear()
+        loaded = self.adapter.load_context(file_path)
+        assert loaded.task_id == "test-task"
+        assert loaded.conversation_history[0]["content"] == "Hello"
+        assert self.adapter.get_context("test-task") is loaded
     
     def test_execution_hooks(self):
         """Test pre and post execution hooks"""
@@ -360,6 +533,22 @@ class TestAgenticAdapter:
         assert stats["success_rate"] == 2/3
         assert stats["average_execution_time"] == 1.5
 
+    def test_execution_stats_after_eviction(self):
+        """Test that running totals drop entries evicted from the history"""
+        context = AgentContext("test-task", "Test task")
+        for i in range(1005):
+            response = AgentResponse(
+                content="ok",
+                state=AgentState.ERROR if i < 5 else AgentState.COMPLETE,
+                execution_time=10.0 if i < 5 else 1.0
+            )
+            self.adapter._log_execution(context, "prompt", response)
+
+        stats = self.adapter.get_execution_stats()
+        assert stats["total_executions"] == 1000
+        assert stats["successful_executions"] == 1000
+        assert stats["total_execution_time"] == pytest.approx(1000.0)
+
 
 class TestUtilityFunctions:
     """Test cases for utility functions"""
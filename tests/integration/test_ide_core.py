@@ -0,0 +1,202 @@
+"""
+Test suite for the shared IDE helper core.
+
+Tests BaseHelper caching, file context, language detection, prompt
+construction and batch splitting without a running Ollama server.
+"""
+
+import io
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'ide-integrations'))
+
+from olympus_ide_core import (
+    BaseHelper, ResponseCache, run_action, metrics_snapshot, serve_daemon
+)
+
+
+def _ok_response(text):
+    response = Mock()
+    response.status_code = 200
+    response.content = json.dumps({"response": text, "done": True}).encode('utf-8')
+    return response
+
+
+class TestBaseHelper:
+    """Test cases for BaseHelper class"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.helper = BaseHelper(model_name="olympus-coder-v1-test")
+        self.helper.session = Mock()
+        self.helper.session.post.return_value = _ok_response("answer")
+
+    def _sent_prompt(self):
+        return json.loads(self.helper.session.post.call_args.kwargs['data'])['prompt']
+
+    def test_call_api_caches_identical_prompts(self):
+        """Test that a repeated prompt is served from the cache"""
+        assert self.helper.call_api("hello") == "answer"
+        assert self.helper.call_api("hello") == "answer"
+
+        assert self.helper.session.post.call_count == 1
+
+    def test_call_api_does_not_cache_errors(self):
+        """Test that error responses are retried rather than cached"""
+        error = Mock(status_code=500, text="boom")
+        self.helper.session.post.return_value = error
+
+        assert self.helper.call_api("hello").startswith("Error: HTTP 500")
+        self.helper.call_api("hello")
+
+        assert self.helper.session.post.call_count == 2
+
+    def test_call_api_reports_connection_errors(self):
+        """Test that request exceptions from an injected session become error text"""
+        import requests
+
+        self.helper.session.post.side_effect = requests.exceptions.ConnectionError()
+        assert self.helper.call_api("hello").startswith("Error: Cannot connect to Ollama")
+
+        self.helper.session.post.side_effect = RuntimeError("boom")
+        assert self.helper.call_api("other") == "Error: boom"
+
+    def test_options_follow_attribute_changes(self):
+        """Test that temperature and max_tokens set after construction are sent"""
+        self.helper.temperature = 0.7
+        self.helper.max_tokens = 256
+        self.helper.call_api("hello")
+
+        options = json.loads(self.helper.session.post.call_args.kwargs['data'])['options']
+        assert options == {"temperature": 0.7, "num_predict": 256}
+
+    def test_detect_language(self):
+        """Test language detection from file extension"""
+        assert self.helper.detect_language("src/app.py") == "Python"
+        assert self.helper.detect_language("C:\\code\\Main.JAVA") == "Java"
+        assert self.helper.detect_language("Makefile") == "Unknown"
+
+    def test_get_file_context_truncates_long_files(self, tmp_path):
+        """Test that long files are reduced to their head and tail"""
+        path = tmp_path / "long.py"
+        path.write_text("".join(f"line {i}\n" for i in range(300)))
+
+        context = self.helper.get_file_context(str(path), max_lines=10)
+
+        assert context.startswith("line 0\n")
+        assert "... (truncated) ..." in context
+        assert context.endswith("line 299\n")
+
+    def test_get_file_context_missing_file(self):
+        """Test the message returned for a missing file"""
+        assert self.helper.get_file_context("/no/such/file.py").startswith("File not found")
+
+    def test_debug_prefers_given_code_over_file(self, tmp_path):
+        """Test that selected code is debugged instead of the whole file"""
+        path = tmp_path / "module.py"
+        path.write_text("whole_file = True\n")
+
+        self.helper.debug_code("selected = 1", str(path))
+        prompt = self._sent_prompt()
+
+        assert "selected = 1" in prompt
+        assert "whole_file" not in prompt
+
+        self.helper.debug_code("", str(path))
+        assert "whole_file = True" in self._sent_prompt()
+
+    def test_selection_file_context(self, tmp_path):
+        """Test that subclasses can include the file content for selections"""
+        path = tmp_path / "module.py"
+        path.write_text("surrounding = True\n")
+
+        self.helper.explain_code("x = 1", str(path))
+        assert "surrounding" not in self._sent_prompt()
+
+        self.helper.selection_file_context = True
+        self.helper.explain_code("x = 2", str(path))
+        assert "surrounding = True" in self._sent_prompt()
+
+    def test_batch_splits_sections(self):
+        """Test that a batched reply is split back per action"""
+        self.helper.session.post.return_value = _ok_response(
+            "<<DEBUG>>\nno bugs\n<<TESTS>>\ndef test_x(): pass"
+        )
+
+        results = self.helper.batch(["debug", "test"], code="x = 1")
+
+        assert results == {"debug": "no bugs", "test": "def test_x(): pass"}
+        assert self.helper.session.post.call_count == 1
+
+    def test_batch_rejects_empty_and_unknown_actions(self):
+        """Test that every entry point gets batch()'s action checks"""
+        with pytest.raises(ValueError):
+            self.helper.batch([], code="x = 1")
+        with pytest.raises(ValueError):
+            self.helper.batch(["health"], code="x = 1")
+
+        requests_in = io.StringIO('{"id": 1, "action": "batch", "actions": [], "text": "x = 1"}\n')
+        with patch("sys.stdin", requests_in), patch("sys.stdout", new_callable=io.StringIO) as out:
+            serve_daemon(self.helper)
+
+        assert "error" in json.loads(out.getvalue())
+        self.helper.session.post.assert_not_called()
+
+    def test_run_action_requires_text(self):
+        """Test that actions on a selection reject missing code"""
+        with pytest.raises(ValueError):
+            run_action(self.helper, "explain")
+        with pytest.raises(ValueError):
+            run_action(self.helper, "unknown")
+
+    def test_timed_actions_report_metrics(self):
+        """Test that action latencies show up in the metrics snapshot"""
+        self.helper.chat("how?")
+
+        snapshot = metrics_snapshot()
+        assert snapshot["chat"]["count"] >= 1
+        assert snapshot["chat"]["p50_us"] is not None
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache class"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ResponseCache(maxsize=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+    def test_expired_entries_are_dropped(self):
+        """Test that entries past their TTL are not returned"""
+        cache = ResponseCache(ttl=-1)
+        cache.put("a", "1")
+
+        assert cache.get("a") is None
+
+    def test_semantic_lookup(self):
+        """Test that similar embeddings hit and dissimilar ones miss"""
+        cache = ResponseCache(similarity_threshold=0.9)
+        cache.put("a", "cached", embedding=[1.0, 0.0])
+
+        assert cache.get_similar([0.99, 0.05]) == "cached"
+        assert cache.get_similar([0.0, 1.0]) is None
+
+    def test_semantic_lookup_is_scoped(self):
+        """Test that similar prompts only match entries with the same scope"""
+        cache = ResponseCache(similarity_threshold=0.9)
+        cache.put("a", "explanation", embedding=[1.0, 0.0], scope=("m", 0.2, 512, "explain"))
+
+        assert cache.get_similar([1.0, 0.0], ("m", 0.2, 512, "explain")) == "explanation"
+        assert cache.get_similar([1.0, 0.0], ("m", 0.1, 1536, "refactor")) is None
+        assert cache.get_similar([1.0, 0.0], ("m", 0.2, 256, "explain")) is None
@@ -0,0 +1,332 @@
+"""
+Test suite for agent logging tools.
+
+Tests AgentLogger structured logging, in-memory log buffering,
+performance statistics and log export.
+"""
+
+import json
+import pytest
+import threading
+import time
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from integration.logging_tools import AgentLogger
+
+
+class TestAgentLogger:
+    """Test cases for AgentLogger class"""
+
+    def test_structured_file_round_trip(self, tmp_path):
+        """Test that structured entries are written as JSON lines"""
+        path = tmp_path / "structured.jsonl"
+        logger = AgentLogger(name="test_structured", structured_file=str(path))
+
+        logger.log_model_interaction(100, 50, 25, 0.5, task_id="task-1")
+        logger.log_tool_execution("read_file", {"path": "a.py"}, {"success": True}, 0.1)
+        logger.close()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+
+        first = json.loads(lines[0])
+        assert first["event_type"] == "model_generate"
+        assert first["task_id"] == "task-1"
+        assert first["data"]["tokens_per_second"] == 50
+        assert json.loads(lines[1])["data"]["tool_name"] == "read_file"
+
+    def test_flush_makes_entries_visible(self, tmp_path):
+        """Test that flush writes buffered entries before close"""
+        path = tmp_path / "structured.jsonl"
+        logger = AgentLogger(name="test_flush", structured_file=str(path))
+
+        logger.log_model_interaction(10, 10, None, 0.1)
+        logger.flush()
+
+        assert len(path.read_text().splitlines()) == 1
+        logger.close()
+
+    def test_idle_writer_flushes_promptly(self, tmp_path):
+        """Test that a lone entry reaches disk without an explicit flush"""
+        path = tmp_path / "structured.jsonl"
+        logger = AgentLogger(name="test_idle_flush", structured_file=str(path))
+
+        logger.log_model_interaction(10, 10, None, 0.1)
+
+        deadline = time.monotonic() + 2
+        while not path.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert len(path.read_text().splitlines()) == 1
+        logger.close()
+
+    def test_concurrent_producers(self, tmp_path):
+        """Test that entries from several threads all reach the file"""
+        path = tmp_path / "structured.jsonl"
+        logger = AgentLogger(name="test_concurrent", structured_file=str(path))
+
+        def produce(n):
+            for i in range(200):
+                logger.log_model_interaction(i, i, None, 0.1, task_id=f"task-{n}")
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+
+        assert len(path.read_text().splitlines()) == 800
+
+    def test_structured_line_ignores_later_mutation(self, tmp_path):
+        """Test that the file records the data as it was when logged"""
+        path = tmp_path / "structured.jsonl"
+        logger = AgentLogger(name="test_mutation", structured_file=str(path))
+
+        parameters = {"path": "a.py"}
+        logger.log_tool_execution("read_file", parameters, {"success": True}, 0.1)
+        parameters["path"] = "b.py"
+        parameters.update((f"k{i}", i) for i in range(100))
+        logger.close()
+
+        entry = json.loads(path.read_text())
+        assert entry["data"]["parameters"] == {"path": "a.py"}
+
+    def test_close_unregisters_atexit(self, tmp_path):
+        """Test that a closed logger is not kept alive by its atexit hook"""
+        import gc
+        import weakref
+
+        logger = AgentLogger(name="test_atexit", structured_file=str(tmp_path / "s.jsonl"))
+        logger.close()
+        ref = weakref.ref(logger)
+        del logger
+        gc.collect()
+
+        assert ref() is None
+
+    def test_entries_after_close_are_not_queued(self, tmp_path):
+        """Test that logging after close() does not fill the undrained queue"""
+        logger = AgentLogger(name="test_after_close", structured_file=str(tmp_path / "s.jsonl"))
+        logger.close()
+        logger.log_model_interaction(1, 1, None, 0.1, task_id="late")
+
+        assert logger.log_queue.empty()
+        assert logger.get_recent_logs()[-1].task_id == "late"
+
+    def test_non_str_fields_are_accepted(self):
+        """Test that levels and components that are not plain str still log"""
+        class Component(str):
+            pass
+
+        logger = AgentLogger(name="test_non_str_fields")
+        logger._add_log_entry(level="INFO", component=Component("parser"), event_type=3,
+                              message="ok")
+
+        entry = logger.get_recent_logs(count=1)[0]
+        assert entry.component == "parser"
+        assert entry.event_type == 3
+
+    def test_max_entries_limit(self):
+        """Test that only the newest entries are kept in memory"""
+        logger = AgentLogger(name="test_max_entries", max_entries=3)
+
+        for i in range(5):
+            logger.log_model_interaction(i, i, None, 0.1, task_id=f"task-{i}")
+
+        logs = logger.get_recent_logs()
+        assert [entry.task_id for entry in logs] == ["task-2", "task-3", "task-4"]
+
+    def test_performance_stats(self):
+        """Test aggregated timings per operation"""
+        logger = AgentLogger(name="test_performance")
+
+        for t in (0.1, 0.3, 0.2):
+            logger.log_tool_execution("write_file", {}, {"success": True}, t)
+
+        stats = logger.get_performance_stats()["tool_write_file"]
+        assert stats["count"] == 3
+        assert stats["total_time"] == pytest.approx(0.6)
+        assert stats["average_time"] == pytest.approx(0.2)
+        assert stats["min_time"] == 0.1
+        assert stats["max_time"] == 0.3
+
+    def test_export_json(self, tmp_path):
+        """Test exporting in-memory entries as a JSON array"""
+        logger = AgentLogger(name="test_export_json")
+        logger.log_tool_execution("read_file", {"path": "a.py"}, {"success": False, "error": "missing"}, 0.1)
+
+        path = tmp_path / "export.json"
+        logger.export_logs(str(path), format_type="json")
+
+        exported = json.loads(path.read_text())
+        assert len(exported) == 1
+        assert exported[0]["level"] == "ERROR"
+        assert exported[0]["error"] == "missing"
+        assert exported[0]["data"]["parameters"] == {"path": "a.py"}
+
+    def test_get_recent_logs_filters(self):
+        """Test filtering recent logs by level and task"""
+        logger = AgentLogger(name="test_recent_filters")
+        for i in range(6):
+            success = i % 2 == 0
+            logger.log_tool_execution("t", {}, {"success": success}, 0.1, task_id=f"task-{i % 3}")
+
+        errors = logger.get_recent_logs(count=2, level="ERROR")
+        assert [e.task_id for e in errors] == ["task-0", "task-2"]
+
+        task_logs = logger.get_recent_logs(count=0, task_id="task-1")
+        assert len(task_logs) == 2
+
+    def test_export_time_range(self, tmp_path):
+        """Test that only entries inside the time range are exported"""
+        logger = AgentLogger(name="test_export_range")
+        for i in range(5):
+            logger.log_model_interaction(i, i, None, 0.1, task_id=f"task-{i}")
+        for i, entry in enumerate(logger.log_entries):
+            entry.timestamp = 100.0 + i
+
+        path = tmp_path / "export.json"
+        logger.export_logs(str(path), start_time=101.0, end_time=103.0)
+
+        exported = json.loads(path.read_text())
+        assert [e["task_id"] for e in exported] == ["task-1", "task-2", "task-3"]
+
+    def test_export_time_range_after_clock_step_back(self, tmp_path):
+        """Test that entries are not lost when the wall clock goes backwards"""
+        from unittest.mock import patch
+
+        logger = AgentLogger(name="test_export_clock_step")
+        logger.logger.setLevel("CRITICAL")
+        clock = iter([105.0, 101.0, 103.0])
+        with patch("integration.logging_tools.time.time", lambda: next(clock, 200.0)):
+            for i in range(3):
+                logger.log_model_interaction(i, i, None, 0.1, task_id=f"task-{i}")
+
+        path = tmp_path / "export.json"
+        logger.export_logs(str(path), start_time=102.0, end_time=106.0)
+
+        exported = json.loads(path.read_text())
+        assert [e["task_id"] for e in exported] == ["task-0", "task-2"]
+
+    def test_log_error_traceback_kept_for_buffered_entries(self):
+        """Test that the traceback is formatted when a stored entry keeps it"""
+        logger = AgentLogger(name="test_error_traceback")
+        try:
+            raise ValueError("bad value")
+        except ValueError as e:
+            logger.log_error(e, component="parser")
+
+        entry = logger.get_recent_logs(count=1)[0]
+        assert "ValueError: bad value" in entry.data["traceback"]
+
+        # The buffer keeps the traceback even when the log line is filtered out
+        logger.logger.setLevel("CRITICAL")
+        try:
+            raise KeyError("missing")
+        except KeyError as e:
+            logger.log_error(e, component="parser")
+
+        entry = logger.get_recent_logs(count=1)[0]
+        assert "KeyError: 'missing'" in entry.data["traceback"]
+        assert logger.get_performance_stats()["error_counts"] == {"ValueError": 1, "KeyError": 1}
+
+    def test_log_error_skips_traceback_when_unused(self):
+        """Test that the traceback is not formatted when nothing keeps it"""
+        from unittest.mock import patch
+
+        logger = AgentLogger(name="test_error_traceback_unused", max_entries=0)
+        logger.logger.setLevel("CRITICAL")
+        with patch("integration.logging_tools.traceback.format_exc") as format_exc:
+            try:
+                raise KeyError("missing")
+            except KeyError as e:
+                logger.log_error(e, component="parser")
+
+        format_exc.assert_not_called()
+        assert logger.get_performance_stats()["error_counts"] == {"KeyError": 1}
+
+    def test_export_csv(self, tmp_path):
+        """Test exporting entries as CSV with JSON-encoded data"""
+        import csv
+
+        logger = AgentLogger(name="test_export_csv")
+        logger.log_tool_execution("read_file", {"path": "a.py"}, {"success": True}, 0.1, task_id="t1")
+
+        path = tmp_path / "export.csv"
+        logger.export_logs(str(path), format_type="csv")
+
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+
+        assert len(rows) == 1
+        assert rows[0]["task_id"] == "t1"
+        assert rows[0]["error"] == ""
+        assert json.loads(rows[0]["data"])["parameters"] == {"path": "a.py"}
+
+    def test_no_entries_without_consumers(self):
+        """Test that entries are skipped when neither buffer nor file is used"""
+        logger = AgentLogger(name="test_no_consumers", max_entries=0)
+
+        logger.log_tool_execution("read_file", {}, {"success": True}, 0.1)
+
+        assert len(logger.log_entries) == 0
+        assert logger.get_performance_stats()["tool_read_file"]["count"] == 1
+
+    def test_log_file_written_by_listener(self, tmp_path):
+        """Test that human-readable log lines reach the log file"""
+        path = tmp_path / "agent.log"
+        logger = AgentLogger(name="test_log_file", log_file=str(path))
+
+        logger.log_tool_execution("read_file", {}, {"success": True}, 0.1)
+        logger.close()
+
+        assert "Tool executed successfully: read_file" in path.read_text()
+
+    def test_concurrent_performance_tracking(self):
+        """Test that timings from several threads are all counted"""
+        logger = AgentLogger(name="test_concurrent_stats", max_entries=10)
+
+        def produce():
+            for _ in range(500):
+                logger.log_tool_execution("grep", {}, {"success": True}, 0.01)
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert logger.get_performance_stats()["tool_grep"]["count"] == 2000
+
+    def test_structured_file_rotation(self, tmp_path):
+        """Test that a full structured file is rotated and gzipped"""
+        import gzip
+
+        path = tmp_path / "structured.jsonl"
+        logger = AgentLogger(name="test_rotation", structured_file=str(path),
+                             structured_max_bytes=1)
+
+        logger.log_model_interaction(10, 10, None, 0.1, task_id="first")
+        logger.flush()
+        logger.log_model_interaction(10, 10, None, 0.1, task_id="second")
+        logger.close()
+
+        archives = sorted(tmp_path.glob("structured.jsonl.*.gz"))
+        assert len(archives) == 2
+        with gzip.open(archives[0], 'rt') as f:
+            assert json.loads(f.read())["task_id"] == "first"
+        assert path.read_text() == ""
+
+    def test_tool_failure_log_line(self, tmp_path):
+        """Test the formatted failure line, including names containing %"""
+        path = tmp_path / "agent.log"
+        logger = AgentLogger(name="test_failure_line", log_file=str(path))
+
+        logger.log_tool_execution("100%_tool", {}, {"success": False, "error": "disk full"}, 0.1)
+        logger.close()
+
+        assert "Tool execution failed: 100%_tool - disk full" in path.read_text()
@@ -5,9 +5,11 @@ Tests the OllamaClient functionality including request formatting,
 response parsing, error handling, and retry logic.
 """
 
+import asyncio
 import json
 import pytest
 import requests
+import time
 from unittest.mock import Mock, patch, MagicMock
 from requests.exceptions import ConnectionError, Timeout, HTTPError
 
@@ -17,7 +19,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from integration.ollama_client import (
     OllamaClient, OllamaError, ModelNotFoundError, APIConnectionError,
-    ModelResponse, GenerateRequest, create_client_from_config
+    ModelResponse, GenerateRequest, RequestCoalescer, create_client_from_config
 )
 
 
@@ -39,14 +41,14 @@ class TestOllamaClient:
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "model": "olympus-coder-v1-test",
             "response": "def hello_world():\n    print('Hello, World!')",
             "done": True,
             "created_at": "2024-01-01T00:00:00Z",
             "total_duration": 1000000,
             "eval_count": 50
-        }
+        }).encode()
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
         
@@ -63,7 +65,7 @@ class TestOllamaClient:
         assert "/api/generate" in call_args[0][1]  # URL
         
         # Verify request data
-        request_data = call_args[1]["json"]
+        request_data = json.loads(call_args[1]["data"])
         assert request_data["model"] == "olympus-coder-v1-test"
         assert request_data["prompt"] == "Write a hello world function in Python"
         assert request_data["options"]["temperature"] == 0.1
@@ -80,12 +82,12 @@ class TestOllamaClient:
         """Test generate request with system prompt"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "model": "olympus-coder-v1-test",
             "response": "Generated response",
             "done": True,
             "created_at": "2024-01-01T00:00:00Z"
-        }
+        }).encode()
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
         
@@ -96,7 +98,7 @@ class TestOllamaClient:
         
         # Verify system prompt was included
         call_args = mock_request.call_args
-        request_data = call_args[1]["json"]
+        request_data = json.loads(call_args[1]["data"])
         assert request_data["system"] == "You are a helpful coding assistant"
     
     @patch('requests.Session.request')
@@ -104,12 +106,12 @@ class TestOllamaClient:
         """Test successful chat request"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "model": "olympus-coder-v1-test",
             "response": "I can help you with that coding task.",
             "done": True,
             "created_at": "2024-01-01T00:00:00Z"
-        }
+        }).encode()
         mock_response.raise_for_status.return_value = None
         mock_request.return_value = mock_response
         
@@ -122,11 +124,115 @@ class TestOllamaClient:
         # Verify request
         call_args = mock_request.call_args
         assert "/api/chat" in call_args[0][1]
-        request_data = call_args[1]["json"]
+        request_data = json.loads(call_args[1]["data"])
         assert request_data["messages"] == messages
         
         # Verify response
         assert result.content == "I can help you with that coding task."
+
+    @patch('requests.Session.request')
+    def test_generate_stream(self, mock_request):
+        """Test that NDJSON chunks are yielded as they are read"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter([
+            b'{"model": "olympus-coder-v1-test", "response": "def ", "done": false}',
+            b'',
+            b'{"model": "olympus-coder-v1-test", "response": "f(): pass", "done": false}',
+            b'{"model": "olympus-coder-v1-test", "response": "", "done": true, "eval_count": 4}'
+        ])
+        mock_response.raise_for_status.return_value = None
+        mock_request.return_value = mock_response
+
+        chunks = list(self.client.generate_stream("Write f"))
+
+        assert mock_request.call_args[1]["stream"] is True
+        assert json.loads(mock_request.call_args[1]["data"])["stream"] is True
+        assert [c.content for c in chunks] == ["def ", "f(): pass", ""]
+        assert chunks[-1].done is True
+        mock_response.close.assert_called_once()
+
+        mock_response.iter_lines.return_value = iter([
+            b'{"response": "a", "done": false}',
+            b'{"response": "b", "done": true, "eval_count": 2}'
+        ])
+        result = self.client.generate("Write f", stream=True)
+
+        assert result.content == "ab"
+        assert result.eval_count == 2
+
+    @patch('integration.ollama_client._load_httpx', return_value=None)
+    @patch('requests.Session.request')
+    def test_agenerate_without_httpx(self, mock_request, mock_load_httpx):
+        """Test that agenerate runs generate in a thread when httpx is missing"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = json.dumps({
+            "model": "olympus-coder-v1-test",
+            "response": "async response",
+            "done": True
+        }).encode()
+        mock_response.raise_for_status.return_value = None
+        mock_request.return_value = mock_response
+        
+        async def run_all():
+            return await asyncio.gather(
+                self.client.agenerate("first"),
+                self.client.achat([{"role": "user", "content": "second"}])
+            )
+        
+        results = asyncio.run(run_all())
+        
+        assert [r.content for r in results] == ["async response", "async response"]
+        assert mock_request.call_count == 2
+    
+    @patch('integration.ollama_client._load_httpx')
+    def test_async_pool_closed_with_its_loop(self, mock_load_httpx):
+        """Test that each event loop's AsyncClient is closed when asyncio.run ends"""
+        from unittest.mock import AsyncMock
+        
+        clients = []
+        
+        def make_client(**kwargs):
+            client = Mock()
+            client.request = AsyncMock(return_value=Mock(raise_for_status=Mock()))
+            client.aclose = AsyncMock()
+            clients.append(client)
+            return client
+        
+        mock_httpx = mock_load_httpx.return_value
+        mock_httpx.AsyncClient.side_effect = make_client
+        
+        async def call():
+            await self.client._amake_request("GET", "/api/tags")
+            await self.client._amake_request("GET", "/api/tags")
+        
+        asyncio.run(call())
+        asyncio.run(call())
+        
+        assert len(clients) == 2
+        assert [c.aclose.await_count for c in clients] == [1, 1]
+        assert clients[0].request.await_count == 2
+    
+    @patch('integration.ollama_client._load_httpx')
+    def test_pool_timeout_reported_separately(self, mock_load_httpx):
+        """Test that waiting for a busy async pool fails fast with its own error"""
+        from unittest.mock import AsyncMock
+        
+        mock_httpx = mock_load_httpx.return_value
+        mock_httpx.TimeoutException = type("TimeoutException", (Exception,), {})
+        mock_httpx.PoolTimeout = type("PoolTimeout", (mock_httpx.TimeoutException,), {})
+        mock_httpx.HTTPStatusError = type("HTTPStatusError", (Exception,), {})
+        mock_httpx.TransportError = type("TransportError", (Exception,), {})
+        client = Mock()
+        client.request = AsyncMock(side_effect=mock_httpx.PoolTimeout("pool"))
+        client.aclose = AsyncMock()
+        mock_httpx.AsyncClient.return_value = client
+        
+        with pytest.raises(OllamaError, match="No free connection"):
+            asyncio.run(self.client._amake_request("GET", "/api/tags"))
+        
+        assert mock_httpx.Timeout.call_args.kwargs["pool"] == self.client.pool_timeout
     
     @patch('requests.Session.request')
     def test_list_models_success(self, mock_request):
@@ -252,6 +358,28 @@ class TestOllamaClient:
         assert health["response_time"] is not None
         assert health["error"] is None
     
+    @patch('requests.Session.request')
+    def test_health_check_model_missing(self, mock_request):
+        """Test that a 404 from /api/show marks the model unavailable"""
+        def respond(method, url, **kwargs):
+            response = Mock()
+            if url.endswith("/api/show"):
+                response.status_code = 404
+                response.raise_for_status.side_effect = HTTPError(response=response)
+            else:
+                response.status_code = 200
+                response.raise_for_status.return_value = None
+            return response
+        
+        mock_request.side_effect = respond
+        
+        health = self.client.health_check()
+        
+        assert mock_request.call_count == 2
+        assert health["server_accessible"] is True
+        assert health["model_available"] is False
+        assert health["error"] is None
+    
     @patch('requests.Session.request')
     def test_health_check_failure(self, mock_request):
         """Test health check with server failure"""
@@ -263,6 +391,18 @@ class TestOllamaClient:
         assert health["model_available"] is False
         assert health["error"] is not None
     
+    @patch('requests.Session.request')
+    def test_probes_fail_fast(self, mock_request):
+        """Test that probes skip retries and use the short timeouts"""
+        mock_request.side_effect = ConnectionError("Connection refused")
+        
+        assert self.client.model_exists() is False
+        assert mock_request.call_args[1]["timeout"] == (2.0, 5.0)
+        
+        probe_adapter = self.client._probe_session.get_adapter(self.client.base_url)
+        assert probe_adapter.max_retries.total == 0
+        assert self.client.session.get_adapter(self.client.base_url).max_retries.total == 2
+    
     def test_serialize_request(self):
         """Test request serialization"""
         request = GenerateRequest(
@@ -283,13 +423,13 @@ class TestOllamaClient:
     def test_parse_response_success(self):
         """Test successful response parsing"""
         mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_response.content = json.dumps({
             "response": "test content",
             "model": "test-model",
             "done": True,
             "created_at": "2024-01-01T00:00:00Z",
             "eval_count": 25
-        }
+        }).encode()
         
         result = self.client._parse_response(mock_response)
         
@@ -302,12 +442,127 @@ class TestOllamaClient:
     def test_parse_response_invalid_json(self):
         """Test response parsing with invalid JSON"""
         mock_response = Mock()
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
+        mock_response.content = b"not json"
         
         with pytest.raises(OllamaError):
             self.client._parse_response(mock_response)
 
 
+class TestRequestCoalescer:
+    """Test cases for RequestCoalescer class"""
+    
+    def test_requests_are_grouped_into_batches(self):
+        """Test that concurrent submissions are sent in batches of max_batch"""
+        in_flight = []
+        peak = []
+        
+        async def generate(prompt, system_prompt, options):
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(prompt)
+            if prompt == "bad":
+                raise OllamaError("boom")
+            return ModelResponse(content=prompt.upper(), model="m", created_at="", done=True)
+        
+        async def run_all():
+            coalescer = RequestCoalescer(generate, batch_window_ms=5, max_batch=2)
+            results = await asyncio.gather(
+                *(coalescer.submit(p) for p in ["a", "b", "bad", "d", "e"]),
+                return_exceptions=True
+            )
+            await coalescer.aclose()
+            return results
+        
+        results = asyncio.run(run_all())
+        
+        assert [r.content for r in results if isinstance(r, ModelResponse)] == ["A", "B", "D", "E"]
+        assert isinstance(results[2], OllamaError)
+        assert max(peak) >= 2
+
+    def test_fast_request_not_held_by_slow_one(self):
+        """Test that each caller is answered when its own request finishes"""
+        finished = {}
+        
+        async def generate(prompt, system_prompt, options):
+            await asyncio.sleep(0.01 if prompt == "fast" else 0.3)
+            return ModelResponse(content=prompt, model="m", created_at="", done=True)
+        
+        async def timed(coalescer, prompt):
+            await coalescer.submit(prompt)
+            finished[prompt] = time.monotonic()
+        
+        async def run_all():
+            coalescer = RequestCoalescer(generate, batch_window_ms=5, max_batch=8)
+            start = time.monotonic()
+            await asyncio.gather(timed(coalescer, "fast"), timed(coalescer, "slow"))
+            await coalescer.aclose()
+            return start
+        
+        start = asyncio.run(run_all())
+        
+        assert finished["fast"] - start < 0.2
+        assert finished["slow"] - start >= 0.3
+
+    def test_batches_are_split_by_length_bin(self):
+        """Test that short and long requests are dispatched separately"""
+        batches = []
+        
+        async def generate(prompt, system_prompt, options):
+            return ModelResponse(content=prompt, model="m", created_at="", done=True)
+        
+        async def run_all():
+            coalescer = RequestCoalescer(generate, batch_window_ms=20, max_batch=8,
+                                         bins=[128, 2048])
+            original = coalescer._dispatch
+            
+            async def record(group):
+                batches.append(sorted(p for _, p, _, _ in group))
+                await original(group)
+            
+            coalescer._dispatch = record
+            await asyncio.gather(
+                coalescer.submit("short-1", options={"num_predict": 64}),
+                coalescer.submit("long-1", options={"num_predict": 4096}),
+                coalescer.submit("short-2", options={"num_predict": 100}),
+                coalescer.submit("x" * 2000)
+            )
+            await coalescer.aclose()
+        
+        asyncio.run(run_all())
+        
+        assert sorted(batches) == [["long-1"], ["short-1", "short-2"], ["x" * 2000]]
+    
+    def test_each_length_bin_has_its_own_window(self):
+        """Test that a full bin is released without waiting on other bins"""
+        finished = {}
+        
+        async def generate(prompt, system_prompt, options):
+            return ModelResponse(content=prompt, model="m", created_at="", done=True)
+        
+        async def timed(coalescer, prompt, num_predict):
+            await coalescer.submit(prompt, options={"num_predict": num_predict})
+            finished[prompt] = time.monotonic()
+        
+        async def run_all():
+            coalescer = RequestCoalescer(generate, batch_window_ms=300, max_batch=2,
+                                         bins=[128])
+            start = time.monotonic()
+            await asyncio.gather(
+                timed(coalescer, "short-1", 64),
+                timed(coalescer, "long-1", 4096),
+                timed(coalescer, "short-2", 64)
+            )
+            await coalescer.aclose()
+            return start
+        
+        start = asyncio.run(run_all())
+        
+        assert finished["short-1"] - start < 0.2
+        assert finished["short-2"] - start < 0.2
+        assert finished["long-1"] - start >= 0.3
+
+
 class TestCreateClientFromConfig:
     """Test cases for create_client_from_config function"""
     
@@ -319,6 +574,10 @@ class TestCreateClientFromConfig:
         assert client.model_name == "olympus-coder-v1"
         assert client.timeout == 60
     
+    def test_clients_are_shared_per_config(self):
+        """Test that the same configuration returns the same client"""
+        assert create_client_from_config() is create_client_from_config()
+    
     @patch('builtins.open')
     def test_create_client_from_file(self, mock_open):
         """Test creating client from configuration file"""
@@ -0,0 +1,125 @@
+"""
+Test suite for integration utilities.
+
+Tests tool request parsing and code block extraction from model
+responses.
+"""
+
+import pytest
+import time
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from integration.utils import parse_tool_response, extract_code_blocks, sanitize_file_path
+
+
+class TestParseToolResponse:
+    """Test cases for parse_tool_response"""
+
+    def test_code_block_tool_request(self):
+        """Test that a fenced tool request is parsed and removed"""
+        text = 'Reading it.\n```json\n{"tool_name": "read_file", "parameters": {"file_path": "a.py"}}\n```\nDone.'
+
+        tool_request, cleaned = parse_tool_response(text)
+
+        assert tool_request.tool_name == "read_file"
+        assert tool_request.parameters == {"file_path": "a.py"}
+        assert cleaned == "Reading it.\n\nDone."
+
+    def test_nested_parameters(self):
+        """Test a direct JSON object with nested braces and braces in strings"""
+        text = ('Tool: {"tool_name": "write_file", "parameters": '
+                '{"file_path": "a.py", "content": "d = {\\"k\\": 1}"}, "confidence": 0.8} ok')
+
+        tool_request, cleaned = parse_tool_response(text)
+
+        assert tool_request.tool_name == "write_file"
+        assert tool_request.parameters["content"] == 'd = {"k": 1}'
+        assert tool_request.confidence == 0.8
+        assert cleaned == "ok"
+
+    def test_skips_invalid_and_unrelated_objects(self):
+        """Test that only an object with tool_name and parameters is used"""
+        text = 'Use {braces} and {"a": 1} then {"tool_name": "list_directory", "parameters": {"path": "."}}'
+
+        tool_request, cleaned = parse_tool_response(text)
+
+        assert tool_request.tool_name == "list_directory"
+        assert cleaned == 'Use {braces} and {"a": 1} then'
+
+    def test_tool_request_inside_invalid_object(self):
+        """Test that an object nested in one that does not parse is still found"""
+        text = '{"note": ' + '{"tool_name": "read_file", "parameters": {"file_path": "a.py"}}' + ', oops}'
+
+        tool_request, cleaned = parse_tool_response(text)
+
+        assert tool_request.tool_name == "read_file"
+        assert cleaned == '{"note": , oops}'
+
+    def test_large_unbalanced_input(self):
+        """Test that many unmatched or invalid braces are scanned in linear time"""
+        tool = '{"tool_name": "read_file", "parameters": {"file_path": "a.py"}}'
+        texts = [
+            "{" * 50000 + tool,
+            '{"tool_name": ' * 20000 + tool,
+            '{"tool_name":' * 20000 + "}" * 20000 + tool,
+        ]
+
+        start = time.monotonic()
+        for text in texts:
+            tool_request, _ = parse_tool_response(text)
+            assert tool_request.tool_name == "read_file"
+        assert time.monotonic() - start < 2
+
+    def test_no_tool_request(self):
+        """Test that plain text is returned unchanged"""
+        text = "def f():\n    return {'a': 1}"
+
+        assert parse_tool_response(text) == (None, text)
+
+
+class TestExtractCodeBlocks:
+    """Test cases for extract_code_blocks"""
+
+    def test_languages(self):
+        """Test fenced blocks with and without a language"""
+        text = "```python\nprint(1)\n```\nand\n```\nplain\n```"
+
+        assert extract_code_blocks(text) == [
+            {"language": "python", "code": "print(1)"},
+            {"language": "text", "code": "plain"}
+        ]
+
+
+class TestSanitizeFilePath:
+    """Test cases for sanitize_file_path"""
+
+    def test_paths_inside_cwd(self):
+        """Test that paths under the working directory stay relative"""
+        assert sanitize_file_path("src/./pkg/../a.py") == os.path.join("src", "a.py")
+        assert sanitize_file_path(os.path.join(os.getcwd(), "a.py")) == "a.py"
+        assert sanitize_file_path("..hidden/a.py") == os.path.join("..hidden", "a.py")
+
+    def test_traversal_reduced_to_file_name(self):
+        """Test that paths leaving the working directory keep only the name"""
+        assert sanitize_file_path("../../../etc/passwd") == "passwd"
+        assert sanitize_file_path("src/../../secret.txt") == "secret.txt"
+        assert sanitize_file_path("/etc/passwd", strict=True) == "passwd"
+
+    def test_strict_follows_symlinks(self, tmp_path, monkeypatch):
+        """Test that only strict mode catches a symlink leading outside the cwd"""
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "secret.txt").write_text("secret")
+        work = tmp_path / "work"
+        work.mkdir()
+        try:
+            (work / "link").symlink_to(outside, target_is_directory=True)
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks are not available")
+        monkeypatch.chdir(work)
+
+        assert sanitize_file_path("link/secret.txt") == os.path.join("link", "secret.txt")
+        assert sanitize_file_path("link/secret.txt", strict=True) == "secret.txt"